@@ -118,6 +118,57 @@ def test_onchain_analytics():
     except Exception as e:
         print(f"❌ Error in holder analysis: {e}")
 
+def test_coin_registry():
+    """Test token resolution against a synthetic coin list (offline)"""
+    print("\n🪙 Testing Coin Registry...")
+
+    import tempfile
+    from tradingagents.dataflows.coin_registry import CoinRegistry
+
+    coins = [
+        {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "platforms": {}},
+        {"id": "harrypotterobamasonic10inu", "symbol": "bitcoin", "name": "HarryPotterObamaSonic10Inu", "platforms": {}},
+        {"id": "solana", "symbol": "sol", "name": "Solana", "platforms": {}},
+        {"id": "wrapped-solana", "symbol": "solana", "name": "Wrapped SOL", "platforms": {}},
+        {"id": "uniswap", "symbol": "uni", "name": "Uniswap",
+         "platforms": {"ethereum": "0x1f9840a85d5af5bf1d1762f925bdaddc4201f984"}},
+    ]
+    registry = CoinRegistry(tempfile.mkdtemp(), lambda: coins)
+
+    # a coin id wins over other coins using that id as their symbol
+    assert registry.resolve("bitcoin") == "bitcoin"
+    assert registry.resolve("solana") == "solana"
+    assert registry.resolve("SOL") == "solana"
+    assert registry.resolve("Wrapped SOL") == "wrapped-solana"
+    assert registry.resolve("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984") == "uniswap"
+    assert registry.resolve("not-a-coin") is None
+    print("✅ Coin registry resolves ids, symbols, names and addresses")
+
+def test_fundamentals_index():
+    """Test point-in-time statement lookups against a synthetic SimFin csv (offline)"""
+    print("\n📑 Testing Fundamentals Index...")
+
+    import os
+    import tempfile
+    from tradingagents.dataflows.fundamentals_index import FundamentalsIndex
+
+    tmp_dir = tempfile.mkdtemp()
+    csv_path = os.path.join(tmp_dir, "statements.csv")
+    with open(csv_path, "w") as f:
+        f.write("Ticker;Report Date;Publish Date;V\n")
+        f.write("A;2019-12-31;2020-02-01;1\n")
+        f.write("A;2020-03-31;2020-05-01;2\n")
+        f.write("A;2020-06-30;;3\n")
+        f.write("B;2020-06-30;;4\n")
+    index = FundamentalsIndex.build(csv_path, os.path.join(tmp_dir, "index"))
+
+    # rows without a publish date are never returned
+    assert index.latest("A", "2021-01-01")["V"] == 2
+    assert index.latest("A", "2020-03-01")["V"] == 1
+    assert index.latest("A", "2020-01-01") is None
+    assert index.latest("B", "2021-01-01") is None
+    print("✅ Fundamentals index returns the latest published statement")
+
 def test_crypto_analysts():
     """Test the crypto analyst functionality"""
     print("\n🤖 Testing Crypto Analysts...")
@@ -196,6 +247,12 @@ def main():
     # Test onchain analytics
     test_onchain_analytics()
     
+    # Test coin registry
+    test_coin_registry()
+
+    # Test fundamentals index
+    test_fundamentals_index()
+
     # Test crypto analysts
     test_crypto_analysts()
     
@@ -6,21 +6,15 @@ Analyzes DeFi protocol data, yield opportunities, and ecosystem metrics
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.dataflows.crypto_utils import CryptoDataProvider
+from langchain_core.runnables import RunnableLambda
 
 def create_crypto_defi_analyst(llm, toolkit):
     """Create a crypto DeFi analyst that focuses on DeFi ecosystem analysis"""
     
-    def crypto_defi_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]  # This will be the token symbol
         
-        # Initialize crypto data provider
-        crypto_provider = CryptoDataProvider()
-        
-        # Get DeFi protocol data
-        defi_data = crypto_provider.get_defi_protocol_analysis(ticker.lower())
-        
         # Create tools for the analyst
         tools = [
             toolkit.get_defi_protocol_data,
@@ -116,11 +110,10 @@ Make sure to append a Markdown table at the end organizing key DeFi metrics and
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
-        
-        chain = prompt | llm.bind_tools(tools)
-        
-        result = chain.invoke(state["messages"])
-        
+
+        return prompt | llm.bind_tools(tools)
+
+    def state_update(result):
         report = ""
         
         if len(result.tool_calls) == 0:
@@ -130,5 +123,13 @@ Make sure to append a Markdown table at the end organizing key DeFi metrics and
             "messages": [result],
             "crypto_defi_report": report,
         }
-    
-    return crypto_defi_analyst_node 
\ No newline at end of file
+
+    def crypto_defi_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return state_update(result)
+
+    async def acrypto_defi_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return state_update(result)
+
+    return RunnableLambda(crypto_defi_analyst_node, afunc=acrypto_defi_analyst_node)
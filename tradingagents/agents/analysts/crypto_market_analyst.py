@@ -6,22 +6,15 @@ Analyzes crypto market data using price oracles and technical indicators
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.dataflows.crypto_utils import CryptoDataProvider
+from langchain_core.runnables import RunnableLambda
 
 def create_crypto_market_analyst(llm, toolkit):
     """Create a crypto market analyst that focuses on crypto-specific metrics"""
     
-    def crypto_market_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]  # This will be the token symbol
         
-        # Initialize crypto data provider
-        crypto_provider = CryptoDataProvider()
-        
-        # Get crypto market data
-        market_data = crypto_provider.get_crypto_market_data(ticker)
-        technical_data = crypto_provider.get_crypto_technical_analysis(ticker)
-        
         # Create tools for the analyst
         tools = [
             toolkit.get_crypto_price_data,
@@ -94,11 +87,10 @@ Make sure to append a Markdown table at the end organizing key metrics and insig
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
-        
-        chain = prompt | llm.bind_tools(tools)
-        
-        result = chain.invoke(state["messages"])
-        
+
+        return prompt | llm.bind_tools(tools)
+
+    def state_update(result):
         report = ""
         
         if len(result.tool_calls) == 0:
@@ -108,5 +100,13 @@ Make sure to append a Markdown table at the end organizing key metrics and insig
             "messages": [result],
             "crypto_market_report": report,
         }
-    
-    return crypto_market_analyst_node 
\ No newline at end of file
+
+    def crypto_market_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return state_update(result)
+
+    async def acrypto_market_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return state_update(result)
+
+    return RunnableLambda(crypto_market_analyst_node, afunc=acrypto_market_analyst_node)
@@ -6,32 +6,14 @@ Analyzes blockchain data including transactions, liquidity pools, and holder met
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.dataflows.crypto_utils import OnchainAnalytics
+from langchain_core.runnables import RunnableLambda
 
 def create_crypto_onchain_analyst(llm, toolkit):
     """Create a crypto onchain analyst that focuses on blockchain data"""
     
-    def crypto_onchain_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]  # This will be the token symbol
-        token_address = state.get("token_address", None)  # Token contract address
-        
-        # Initialize onchain analytics
-        onchain_analytics = OnchainAnalytics()
-        
-        # Get onchain data if address is available
-        onchain_data = {}
-        if token_address:
-            onchain_data = onchain_analytics.get_token_onchain_data(token_address)
-            liquidity_metrics = onchain_analytics.analyze_liquidity_metrics(token_address)
-            holder_metrics = onchain_analytics.analyze_holder_metrics(token_address)
-            transaction_metrics = onchain_analytics.analyze_transaction_metrics(token_address)
-        else:
-            # Fallback to basic analysis without onchain data
-            onchain_data = {"error": "No token address provided"}
-            liquidity_metrics = {"error": "No token address provided"}
-            holder_metrics = {"error": "No token address provided"}
-            transaction_metrics = {"error": "No token address provided"}
         
         # Create tools for the analyst
         tools = [
@@ -121,11 +103,10 @@ Make sure to append a Markdown table at the end organizing key onchain metrics a
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
-        
-        chain = prompt | llm.bind_tools(tools)
-        
-        result = chain.invoke(state["messages"])
-        
+
+        return prompt | llm.bind_tools(tools)
+
+    def state_update(result):
         report = ""
         
         if len(result.tool_calls) == 0:
@@ -135,5 +116,13 @@ Make sure to append a Markdown table at the end organizing key onchain metrics a
             "messages": [result],
             "crypto_onchain_report": report,
         }
-    
-    return crypto_onchain_analyst_node 
\ No newline at end of file
+
+    def crypto_onchain_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return state_update(result)
+
+    async def acrypto_onchain_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return state_update(result)
+
+    return RunnableLambda(crypto_onchain_analyst_node, afunc=acrypto_onchain_analyst_node)
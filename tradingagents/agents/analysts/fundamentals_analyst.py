@@ -1,10 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -47,10 +48,9 @@ def create_fundamentals_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def state_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -61,4 +61,12 @@ def create_fundamentals_analyst(llm, toolkit):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    def fundamentals_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return state_update(result)
+
+    async def afundamentals_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return state_update(result)
+
+    return RunnableLambda(fundamentals_analyst_node, afunc=afundamentals_analyst_node)
@@ -1,11 +1,12 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_market_analyst(llm, toolkit):
 
-    def market_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -72,10 +73,9 @@ Volume-Based Indicators:
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def state_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -86,4 +86,12 @@ Volume-Based Indicators:
             "market_report": report,
         }
 
-    return market_analyst_node
+    def market_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return state_update(result)
+
+    async def amarket_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return state_update(result)
+
+    return RunnableLambda(market_analyst_node, afunc=amarket_analyst_node)
@@ -1,23 +1,26 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
+    def situation(state) -> str:
+        market_research_report = state["market_report"]
+        sentiment_report = state["sentiment_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def build_prompt(state, past_memories):
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
-        bear_history = investment_debate_state.get("bear_history", "")
-
         current_response = investment_debate_state.get("current_response", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
@@ -43,8 +46,12 @@ Last bull argument: {current_response}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bear argument, refute the bull's claims, and engage in a dynamic debate that demonstrates the risks and weaknesses of investing in the stock. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
+        return prompt
 
-        response = llm.invoke(prompt)
+    def state_update(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bear_history = investment_debate_state.get("bear_history", "")
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -58,4 +65,14 @@ Use this information to deliver a compelling bear argument, refute the bull's cl
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    def bear_node(state) -> dict:
+        past_memories = memory.get_memories(situation(state), n_matches=2)
+        response = llm.invoke(build_prompt(state, past_memories))
+        return state_update(state, response)
+
+    async def abear_node(state) -> dict:
+        past_memories = await memory.aget_memories(situation(state), n_matches=2)
+        response = await llm.ainvoke(build_prompt(state, past_memories))
+        return state_update(state, response)
+
+    return RunnableLambda(bear_node, afunc=abear_node)
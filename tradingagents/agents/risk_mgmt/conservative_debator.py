@@ -1,13 +1,13 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+    def build_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
-        safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
@@ -32,8 +32,12 @@ Company Fundamentals Report: {fundamentals_report}
 Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
+        return prompt
 
-        response = llm.invoke(prompt)
+    def state_update(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -55,4 +59,12 @@ Engage by questioning their optimism and emphasizing the potential downsides the
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return state_update(state, response)
+
+    async def asafe_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return state_update(state, response)
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
@@ -1,12 +1,12 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+    def build_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
-        neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
@@ -31,8 +31,12 @@ Company Fundamentals Report: {fundamentals_report}
 Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the safe analyst: {current_safe_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
+        return prompt
 
-        response = llm.invoke(prompt)
+    def state_update(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        neutral_history = risk_debate_state.get("neutral_history", "")
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -52,4 +56,12 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    def neutral_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return state_update(state, response)
+
+    async def aneutral_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return state_update(state, response)
+
+    return RunnableLambda(neutral_node, afunc=aneutral_node)
@@ -1,19 +1,20 @@
 import functools
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
-        company_name = state["company_of_interest"]
-        investment_plan = state["investment_plan"]
+    def situation(state) -> str:
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    def build_prompt(state, past_memories):
+        company_name = state["company_of_interest"]
+        investment_plan = state["investment_plan"]
 
         past_memory_str = ""
         if past_memories:
@@ -34,13 +35,26 @@ def create_trader(llm, memory):
             },
             context,
         ]
+        return messages
 
-        result = llm.invoke(messages)
-
+    def state_update(state, result, name) -> dict:
         return {
             "messages": [result],
             "trader_investment_plan": result.content,
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    def trader_node(state, name):
+        past_memories = memory.get_memories(situation(state), n_matches=2)
+        result = llm.invoke(build_prompt(state, past_memories))
+        return state_update(state, result, name)
+
+    async def atrader_node(state, name):
+        past_memories = await memory.aget_memories(situation(state), n_matches=2)
+        result = await llm.ainvoke(build_prompt(state, past_memories))
+        return state_update(state, result, name)
+
+    return RunnableLambda(
+        functools.partial(trader_node, name="Trader"),
+        afunc=functools.partial(atrader_node, name="Trader"),
+    )
@@ -1,3 +1,4 @@
+import operator
 from typing import Annotated, Sequence
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
@@ -5,6 +6,12 @@ from langchain_openai import ChatOpenAI
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from langgraph.graph.message import AnyMessage, add_messages
+
+
+def analyst_channel(analyst_type: str) -> str:
+    """State key of an analyst's own messages when the analysts run in parallel."""
+    return f"{analyst_type}_messages"
 
 
 # Researcher team state
@@ -61,12 +68,26 @@ class AgentState(MessagesState):
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
 
+    # per-analyst tool-calling conversations, used instead of messages when
+    # the analysts run in parallel
+    market_messages: Annotated[list[AnyMessage], add_messages]
+    social_messages: Annotated[list[AnyMessage], add_messages]
+    news_messages: Annotated[list[AnyMessage], add_messages]
+    fundamentals_messages: Annotated[list[AnyMessage], add_messages]
+    crypto_market_messages: Annotated[list[AnyMessage], add_messages]
+    crypto_onchain_messages: Annotated[list[AnyMessage], add_messages]
+    crypto_defi_messages: Annotated[list[AnyMessage], add_messages]
+
     # researcher team discussion step
     investment_debate_state: Annotated[
         InvestDebateState, "Current state of the debate on if to invest or not"
     ]
     investment_plan: Annotated[str, "Plan generated by the Analyst"]
 
+    # opening arguments given concurrently, by speaker, before they are
+    # merged into the debate states
+    debate_openings: Annotated[dict, operator.or_]
+
     trader_investment_plan: Annotated[str, "Plan generated by the Trader"]
 
     # risk management team discussion step
@@ -6,20 +6,32 @@ from langchain_core.messages import RemoveMessage
 from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
 import functools
+import json
+import threading
 import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
-from tradingagents.dataflows.crypto_utils import CryptoDataProvider, OnchainAnalytics
+from tradingagents.dataflows.crypto_utils import (
+    CryptoDataProvider,
+    CryptoPriceOracle,
+    OnchainAnalytics,
+    crypto_run,
+)
+from tradingagents.dataflows.streaming_indicators import (
+    OraclePriceSource,
+    get_streaming_hub,
+)
+from tradingagents.agents.utils.tool_replay import replayable
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
 
 
-def create_msg_delete():
+def create_msg_delete(messages_key="messages"):
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
+        messages = state[messages_key]
         
         # Remove all messages
         removal_operations = [RemoveMessage(id=m.id) for m in messages]
@@ -27,19 +39,74 @@ def create_msg_delete():
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
         
-        return {"messages": removal_operations + [placeholder]}
+        return {messages_key: removal_operations + [placeholder]}
     
     return delete_messages
 
 
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
+    # crypto data sources shared by all tool calls, created on first use
+    _crypto_provider = None
+    _onchain_analytics = {}
+    _crypto_lock = threading.Lock()
 
     @classmethod
     def update_config(cls, config):
         """Update the class-level configuration."""
         cls._config.update(config)
 
+    @classmethod
+    def get_crypto_provider(cls) -> CryptoDataProvider:
+        """Long-lived crypto data provider shared by the crypto tools."""
+        with cls._crypto_lock:
+            if cls._crypto_provider is None:
+                cls._crypto_provider = CryptoDataProvider(
+                    price_oracle=CryptoPriceOracle(
+                        max_bytes=cls._config.get("crypto_cache_max_bytes")
+                    ),
+                    onchain_timeout=cls._config.get("onchain_call_timeout", 30),
+                    memo_ttl=cls._config.get("crypto_memo_ttl", 30 * 60),
+                    memo_max_entries=cls._config.get("crypto_memo_max_entries", 1024),
+                )
+            return cls._crypto_provider
+
+    @classmethod
+    def get_onchain_analytics(cls, network: str = "ethereum") -> OnchainAnalytics:
+        """Long-lived onchain analytics for a network."""
+        provider = cls.get_crypto_provider()
+        if network == provider.network:
+            return provider.onchain_analytics
+        with cls._crypto_lock:
+            if network not in cls._onchain_analytics:
+                cls._onchain_analytics[network] = OnchainAnalytics(
+                    network, timeout=cls._config.get("onchain_call_timeout", 30)
+                )
+            return cls._onchain_analytics[network]
+
+    @classmethod
+    def start_crypto_stream(cls, tokens: List[str], source=None):
+        """Keep live indicators of tokens (symbols or ids) for the crypto technical tool.
+
+        Prices are polled from the shared price oracle every
+        crypto_stream_interval seconds unless another source (e.g. a
+        ReplayPriceSource) is given.
+        """
+        provider = cls.get_crypto_provider()
+        token_ids = [provider.coin_registry.resolve(token) for token in tokens]
+        hub = get_streaming_hub()
+        hub.min_ticks = cls._config.get("crypto_stream_min_ticks", 50)
+        hub.source = source or OraclePriceSource(
+            provider.price_oracle, [token_id for token_id in token_ids if token_id]
+        )
+        hub.start(cls._config.get("crypto_stream_interval", 60))
+        return hub
+
+    @staticmethod
+    def run_scope(run_id: str):
+        """Context in which the crypto tools memoize their data for run_id only."""
+        return crypto_run(run_id)
+
     @property
     def config(self):
         """Access the configuration."""
@@ -51,6 +118,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_reddit_news(
         curr_date: Annotated[str, "Date you want to get news for in yyyy-mm-dd format"],
     ) -> str:
@@ -68,6 +136,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_finnhub_news(
         ticker: Annotated[
             str,
@@ -100,6 +169,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_reddit_stock_info(
         ticker: Annotated[
             str,
@@ -122,6 +192,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_YFin_data(
         symbol: Annotated[str, "ticker symbol of the company"],
         start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -143,6 +214,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_YFin_data_online(
         symbol: Annotated[str, "ticker symbol of the company"],
         start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -164,10 +236,12 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_stockstats_indicators_report(
         symbol: Annotated[str, "ticker symbol of the company"],
         indicator: Annotated[
-            str, "technical indicator to get the analysis and report of"
+            str,
+            "technical indicator to get the analysis and report of, several can be passed comma-separated",
         ],
         curr_date: Annotated[
             str, "The current trading date you are trading on, YYYY-mm-dd"
@@ -178,7 +252,7 @@ class Toolkit:
         Retrieve stock stats indicators for a given ticker symbol and indicator.
         Args:
             symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-            indicator (str): Technical indicator to get the analysis and report of
+            indicator (str): Technical indicator to get the analysis and report of, e.g. "rsi" or "rsi,macd,boll" for several at once
             curr_date (str): The current trading date you are trading on, YYYY-mm-dd
             look_back_days (int): How many days to look back, default is 30
         Returns:
@@ -193,10 +267,12 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_stockstats_indicators_report_online(
         symbol: Annotated[str, "ticker symbol of the company"],
         indicator: Annotated[
-            str, "technical indicator to get the analysis and report of"
+            str,
+            "technical indicator to get the analysis and report of, several can be passed comma-separated",
         ],
         curr_date: Annotated[
             str, "The current trading date you are trading on, YYYY-mm-dd"
@@ -207,7 +283,7 @@ class Toolkit:
         Retrieve stock stats indicators for a given ticker symbol and indicator.
         Args:
             symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-            indicator (str): Technical indicator to get the analysis and report of
+            indicator (str): Technical indicator to get the analysis and report of, e.g. "rsi" or "rsi,macd,boll" for several at once
             curr_date (str): The current trading date you are trading on, YYYY-mm-dd
             look_back_days (int): How many days to look back, default is 30
         Returns:
@@ -222,6 +298,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_finnhub_company_insider_sentiment(
         ticker: Annotated[str, "ticker symbol for the company"],
         curr_date: Annotated[
@@ -239,13 +316,14 @@ class Toolkit:
         """
 
         data_sentiment = interface.get_finnhub_company_insider_sentiment(
-            ticker, curr_date, 30
+            ticker, curr_date, 30, Toolkit._config.get("insider_max_records")
         )
 
         return data_sentiment
 
     @staticmethod
     @tool
+    @replayable
     def get_finnhub_company_insider_transactions(
         ticker: Annotated[str, "ticker symbol"],
         curr_date: Annotated[
@@ -263,13 +341,14 @@ class Toolkit:
         """
 
         data_trans = interface.get_finnhub_company_insider_transactions(
-            ticker, curr_date, 30
+            ticker, curr_date, 30, Toolkit._config.get("insider_max_records")
         )
 
         return data_trans
 
     @staticmethod
     @tool
+    @replayable
     def get_simfin_balance_sheet(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -294,6 +373,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_simfin_cashflow(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -318,6 +398,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_simfin_income_stmt(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -344,6 +425,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_google_news(
         query: Annotated[str, "Query to search with"],
         curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -365,6 +447,7 @@ class Toolkit:
     # Crypto-specific tools
     @staticmethod
     @tool
+    @replayable
     def get_crypto_price_data(
         token_symbol: Annotated[str, "Token symbol (e.g., BTC, ETH, UNI)"],
         vs_currency: Annotated[str, "Quote currency (e.g., USD, EUR)"] = "usd",
@@ -377,8 +460,8 @@ class Toolkit:
         Returns:
             str: Current price data and market metrics
         """
-        crypto_provider = CryptoDataProvider()
-        market_data = crypto_provider.get_crypto_market_data(token_symbol)
+        crypto_provider = Toolkit.get_crypto_provider()
+        market_data = crypto_provider.get_crypto_market_data(token_symbol, include=("price",))
         
         if "error" in market_data.get("price_data", {}):
             return f"Error getting price data for {token_symbol}: {market_data['price_data']['error']}"
@@ -388,6 +471,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_crypto_technical_indicators(
         token_symbol: Annotated[str, "Token symbol (e.g., BTC, ETH, UNI)"],
     ):
@@ -398,7 +482,7 @@ class Toolkit:
         Returns:
             str: Technical analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         technical_data = crypto_provider.get_crypto_technical_analysis(token_symbol)
         
         if "error" in technical_data:
@@ -408,6 +492,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_crypto_market_metrics(
         token_symbol: Annotated[str, "Token symbol (e.g., BTC, ETH, UNI)"],
     ):
@@ -418,8 +503,8 @@ class Toolkit:
         Returns:
             str: Market metrics data
         """
-        crypto_provider = CryptoDataProvider()
-        market_data = crypto_provider.get_crypto_market_data(token_symbol)
+        crypto_provider = Toolkit.get_crypto_provider()
+        market_data = crypto_provider.get_crypto_market_data(token_symbol, include=("market",))
         
         if "error" in market_data.get("market_data", {}):
             return f"Error getting market data for {token_symbol}: {market_data['market_data']['error']}"
@@ -428,6 +513,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_crypto_volume_analysis(
         token_symbol: Annotated[str, "Token symbol (e.g., BTC, ETH, UNI)"],
     ):
@@ -438,13 +524,13 @@ class Toolkit:
         Returns:
             str: Volume analysis data
         """
-        crypto_provider = CryptoDataProvider()
-        market_data = crypto_provider.get_crypto_market_data(token_symbol)
+        crypto_provider = Toolkit.get_crypto_provider()
+        market_data = crypto_provider.get_crypto_market_data(token_symbol, include=("price",))
         
         if "error" in market_data.get("price_data", {}):
             return f"Error getting volume data for {token_symbol}: {market_data['price_data']['error']}"
         
-        price_data = market_data["price_data"]
+        price_data = market_data["price_data"].get(market_data["token_id"], {})
         volume_24h = price_data.get("usd_24h_vol", 0)
         market_cap = price_data.get("usd_market_cap", 0)
         
@@ -452,6 +538,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_onchain_liquidity_data(
         token_address: Annotated[str, "Token contract address"],
         network: Annotated[str, "Blockchain network (e.g., ethereum, polygon)"] = "ethereum",
@@ -464,7 +551,7 @@ class Toolkit:
         Returns:
             str: Liquidity analysis data
         """
-        onchain_analytics = OnchainAnalytics(network)
+        onchain_analytics = Toolkit.get_onchain_analytics(network)
         liquidity_data = onchain_analytics.analyze_liquidity_metrics(token_address)
         
         if "error" in liquidity_data:
@@ -474,6 +561,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_onchain_holder_data(
         token_address: Annotated[str, "Token contract address"],
         network: Annotated[str, "Blockchain network (e.g., ethereum, polygon)"] = "ethereum",
@@ -486,7 +574,7 @@ class Toolkit:
         Returns:
             str: Holder analysis data
         """
-        onchain_analytics = OnchainAnalytics(network)
+        onchain_analytics = Toolkit.get_onchain_analytics(network)
         holder_data = onchain_analytics.analyze_holder_metrics(token_address)
         
         if "error" in holder_data:
@@ -496,6 +584,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_onchain_transaction_data(
         token_address: Annotated[str, "Token contract address"],
         network: Annotated[str, "Blockchain network (e.g., ethereum, polygon)"] = "ethereum",
@@ -508,7 +597,7 @@ class Toolkit:
         Returns:
             str: Transaction analysis data
         """
-        onchain_analytics = OnchainAnalytics(network)
+        onchain_analytics = Toolkit.get_onchain_analytics(network)
         transaction_data = onchain_analytics.analyze_transaction_metrics(token_address)
         
         if "error" in transaction_data:
@@ -518,6 +607,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_onchain_supply_data(
         token_address: Annotated[str, "Token contract address"],
         network: Annotated[str, "Blockchain network (e.g., ethereum, polygon)"] = "ethereum",
@@ -530,7 +620,7 @@ class Toolkit:
         Returns:
             str: Supply analysis data
         """
-        onchain_analytics = OnchainAnalytics(network)
+        onchain_analytics = Toolkit.get_onchain_analytics(network)
         onchain_data = onchain_analytics.get_token_onchain_data(token_address)
         
         if "error" in onchain_data:
@@ -541,6 +631,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_defi_protocol_data(
         protocol: Annotated[str, "DeFi protocol name (e.g., uniswap, aave, compound)"],
     ):
@@ -551,7 +642,7 @@ class Toolkit:
         Returns:
             str: Protocol analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         protocol_data = crypto_provider.get_defi_protocol_analysis(protocol)
         
         if "error" in protocol_data:
@@ -561,6 +652,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_defi_yield_data(
         protocol: Annotated[str, "DeFi protocol name (e.g., uniswap, aave, compound)"],
     ):
@@ -571,7 +663,7 @@ class Toolkit:
         Returns:
             str: Yield analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         protocol_data = crypto_provider.get_defi_protocol_analysis(protocol)
         
         if "error" in protocol_data:
@@ -581,6 +673,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_defi_tvl_data(
         protocol: Annotated[str, "DeFi protocol name (e.g., uniswap, aave, compound)"],
     ):
@@ -591,7 +684,7 @@ class Toolkit:
         Returns:
             str: TVL analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         protocol_data = crypto_provider.get_defi_protocol_analysis(protocol)
         
         if "error" in protocol_data:
@@ -605,6 +698,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_defi_governance_data(
         protocol: Annotated[str, "DeFi protocol name (e.g., uniswap, aave, compound)"],
     ):
@@ -615,7 +709,7 @@ class Toolkit:
         Returns:
             str: Governance analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         protocol_data = crypto_provider.get_defi_protocol_analysis(protocol)
         
         if "error" in protocol_data:
@@ -625,6 +719,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_defi_risk_data(
         protocol: Annotated[str, "DeFi protocol name (e.g., uniswap, aave, compound)"],
     ):
@@ -635,7 +730,7 @@ class Toolkit:
         Returns:
             str: Risk analysis data
         """
-        crypto_provider = CryptoDataProvider()
+        crypto_provider = Toolkit.get_crypto_provider()
         protocol_data = crypto_provider.get_defi_protocol_analysis(protocol)
         
         if "error" in protocol_data:
@@ -645,6 +740,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_stock_news_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -664,6 +760,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_global_news_openai(
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
     ):
@@ -681,6 +778,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @replayable
     def get_fundamentals_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -1,6 +1,6 @@
 import chromadb
 from chromadb.config import Settings
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 
 class FinancialSituationMemory:
@@ -10,6 +10,7 @@ class FinancialSituationMemory:
         else:
             self.embedding = "text-embedding-3-small"
         self.client = OpenAI(base_url=config["backend_url"])
+        self.async_client = AsyncOpenAI(base_url=config["backend_url"])
         self.chroma_client = chromadb.Client(Settings(allow_reset=True))
         self.situation_collection = self.chroma_client.create_collection(name=name)
 
@@ -46,8 +47,16 @@ class FinancialSituationMemory:
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+        return self._match(self.get_embedding(current_situation), n_matches)
 
+    async def aget_memories(self, current_situation, n_matches=1):
+        """Async get_memories, awaiting the embedding request"""
+        response = await self.async_client.embeddings.create(
+            model=self.embedding, input=current_situation
+        )
+        return self._match(response.data[0].embedding, n_matches)
+
+    def _match(self, query_embedding, n_matches):
         results = self.situation_collection.query(
             query_embeddings=[query_embedding],
             n_results=n_matches,
@@ -0,0 +1,132 @@
+import functools
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict
+
+from tradingagents.dataflows.config import get_config
+
+REPLAY_MODES = ("off", "record", "replay")
+
+
+class ReplayMiss(LookupError):
+    """A tool call missing from the replay store."""
+
+
+class ToolReplayStore:
+    """Content-addressed store of tool outputs.
+
+    Outputs are json encoded, gzipped and stored once under the sha256 of
+    their content; every recorded call points at its output through a ref
+    named after the sha256 of the tool name and its normalized arguments:
+
+        {store_dir}/objects/{sha[:2]}/{sha}.json.gz
+        {store_dir}/refs/{sha[:2]}/{sha}
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    @staticmethod
+    def call_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        payload = json.dumps([tool_name, arguments], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, kind: str, digest: str, suffix: str = "") -> str:
+        return os.path.join(self.store_dir, kind, digest[:2], digest + suffix)
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, key: str, output: Any):
+        content = json.dumps(output, default=str).encode()
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self._path("objects", digest, ".json.gz")
+        if not os.path.exists(object_path):
+            # mtime=0 keeps the gzip bytes a function of the content alone
+            self._write(object_path, gzip.compress(content, mtime=0))
+        self._write(self._path("refs", key), digest.encode())
+
+    def get(self, key: str) -> Any:
+        """Recorded output of a call, raising ReplayMiss if it was never recorded."""
+        try:
+            with open(self._path("refs", key), "rb") as f:
+                digest = f.read().decode()
+            with gzip.open(self._path("objects", digest, ".json.gz"), "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            raise ReplayMiss(key) from None
+
+
+_stores: Dict[str, ToolReplayStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_replay_store() -> ToolReplayStore:
+    """Process-wide store in tool_replay_dir (default: data_cache_dir/tool_replay)."""
+    config = get_config()
+    store_dir = config.get("tool_replay_dir") or os.path.join(
+        config["data_cache_dir"], "tool_replay"
+    )
+    with _stores_lock:
+        if store_dir not in _stores:
+            _stores[store_dir] = ToolReplayStore(store_dir)
+        return _stores[store_dir]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    return value
+
+
+def replayable(func: Callable) -> Callable:
+    """Records or replays the outputs of a tool function, per tool_replay_mode.
+
+    Goes between @tool and the function. "record" calls the tool and stores
+    its output under its name and normalized arguments (defaults applied,
+    strings stripped), "replay" serves outputs from the store without
+    calling the tool and raises ReplayMiss for calls never recorded, "off"
+    (the default) just calls the tool.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        mode = get_config().get("tool_replay_mode", "off")
+        if mode == "off":
+            return func(*args, **kwargs)
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unsupported tool_replay_mode: {mode}")
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = _normalize(dict(bound.arguments))
+        store = get_replay_store()
+        key = store.call_key(func.__name__, arguments)
+        if mode == "replay":
+            try:
+                return store.get(key)
+            except ReplayMiss:
+                raise ReplayMiss(
+                    f"No recorded output for {func.__name__} with {arguments}"
+                ) from None
+
+        output = func(*args, **kwargs)
+        store.put(key, output)
+        return output
+
+    return wrapper
@@ -3,6 +3,7 @@ from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
 from .reddit_utils import fetch_top_from_category
 from .stockstats_utils import StockstatsUtils
+from .prefetch import prefetch_bars
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -43,4 +44,5 @@ __all__ = [
     # Market data functions
     "get_YFin_data_window",
     "get_YFin_data",
+    "prefetch_bars",
 ]
@@ -0,0 +1,267 @@
+import glob
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Annotated, Callable, Dict, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, fall back to in-process locking
+    fcntl = None
+
+DATE_COLUMN = "Date"
+HISTORY_YEARS = 15
+
+# relative difference of the overlapping bar's close beyond which the stored
+# history is considered re-adjusted (split, dividend) and downloaded again
+_ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def download_bars(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "first day to fetch, yyyy-mm-dd"],
+    end_date: Annotated[str, "day after the last day to fetch, yyyy-mm-dd"],
+) -> pd.DataFrame:
+    """Daily adjusted OHLCV bars of a symbol (with dividends and splits) from Yahoo Finance."""
+    return yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+        actions=True,
+    )
+
+
+class BarStore:
+    """Per-symbol, append-only store of daily bars fetched online.
+
+    Each symbol has a csv of its bars and a json sidecar recording the first
+    and last stored dates, the close of the last bar and the date up to which
+    the history was last checked:
+
+        {store_dir}/{symbol}.csv
+        {store_dir}/{symbol}.json
+
+    Updating a symbol only downloads the bars after its last stored date. The
+    last stored bar is fetched again with the tail; if its close moved, Yahoo
+    re-adjusted the history and the whole range is downloaded again. Files
+    are rewritten through a temporary copy and os.replace under a per-symbol
+    file lock, so concurrent processes never see or produce a partial file.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+
+    def bars_path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{symbol}.csv")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{symbol}.json")
+
+    def meta(self, symbol: str) -> Optional[dict]:
+        """Sidecar of a stored symbol, None if nothing is stored yet."""
+        meta_path = self._meta_path(symbol)
+        if not os.path.exists(meta_path) or not os.path.exists(self.bars_path(symbol)):
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def lock(self, symbol: str):
+        """Exclusive access to a symbol across threads and processes."""
+        with self._locks_lock:
+            thread_lock = self._locks.setdefault(symbol, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.store_dir, f"{symbol}.lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def missing_start(
+        self,
+        symbol: str,
+        end_date: Annotated[str, "day after the last bar needed, yyyy-mm-dd"],
+    ) -> Optional[str]:
+        """First day to download for the store to cover end_date, None if covered."""
+        meta = self.meta(symbol)
+        if meta is None:
+            start = pd.Timestamp(end_date) - pd.DateOffset(years=HISTORY_YEARS)
+            return start.strftime("%Y-%m-%d")
+        if meta["checked_through"] >= end_date:
+            return None
+        return meta["last_date"]
+
+    def read(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Stored bars from start_date up to (excluding) end_date, indexed by Date."""
+        bars = pd.read_csv(self.bars_path(symbol))
+        bars = bars[(bars[DATE_COLUMN] >= start_date) & (bars[DATE_COLUMN] < end_date)]
+        bars = bars.set_index(pd.DatetimeIndex(bars[DATE_COLUMN], name=DATE_COLUMN))
+        return bars.drop(columns=DATE_COLUMN)
+
+    def covers(self, symbol: str, start_date: str, end_date: str) -> bool:
+        """Whether every bar from start_date up to (excluding) end_date is stored."""
+        meta = self.meta(symbol)
+        return (
+            meta is not None
+            and meta["first_date"] <= start_date
+            and meta["checked_through"] >= end_date
+        )
+
+    def update(
+        self,
+        symbol: str,
+        end_date: Optional[str] = None,
+        downloader: Callable[[str, str, str], pd.DataFrame] = download_bars,
+    ) -> str:
+        """Bring a symbol up to end_date (default today) and return its csv path."""
+        if end_date is None:
+            end_date = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+        with self.lock(symbol):
+            start_date = self.missing_start(symbol, end_date)
+            if start_date is not None:
+                bars = downloader(symbol, start_date, end_date)
+                self.merge(symbol, bars, end_date, downloader)
+        return self.bars_path(symbol)
+
+    def merge(
+        self,
+        symbol: str,
+        bars: pd.DataFrame,
+        end_date: str,
+        downloader: Callable[[str, str, str], pd.DataFrame] = download_bars,
+    ):
+        """Append downloaded bars to a symbol; the caller holds its lock.
+
+        bars holds the bars from the symbol's missing_start up to end_date,
+        with the dates either as index or as a Date column.
+        """
+        bars = _normalize(bars)
+        if len(bars) == 0:
+            # a tail always repeats the last stored bar, nothing came back at
+            # all means the download failed: keep the store as is and retry later
+            return
+        meta = self.meta(symbol)
+
+        if meta is not None:
+            overlap = bars[bars[DATE_COLUMN] == meta["last_date"]]
+            if len(overlap) > 0 and _moved(overlap["Close"].iloc[0], meta["last_close"]):
+                # history was re-adjusted, replace it as a whole
+                bars = _normalize(downloader(symbol, meta["first_date"], end_date))
+                meta = None
+
+        if meta is None:
+            if len(bars) == 0:
+                return
+            self._write(symbol, bars, append=False)
+            first_date = bars[DATE_COLUMN].iloc[0]
+        else:
+            bars = bars[bars[DATE_COLUMN] > meta["last_date"]]
+            if len(bars) > 0:
+                self._write(symbol, bars, append=True)
+            first_date = meta["first_date"]
+
+        if len(bars) > 0:
+            last_date = bars[DATE_COLUMN].iloc[-1]
+            last_close = float(bars["Close"].iloc[-1])
+        else:
+            last_date, last_close = meta["last_date"], meta["last_close"]
+
+        self._write_meta(
+            symbol,
+            {
+                "first_date": first_date,
+                "last_date": last_date,
+                "last_close": last_close,
+                "checked_through": end_date,
+            },
+        )
+        if meta is None:
+            self._remove_legacy_files(symbol)
+
+    def _write(self, symbol: str, bars: pd.DataFrame, append: bool):
+        path = self.bars_path(symbol)
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        try:
+            if append:
+                columns = pd.read_csv(path, nrows=0).columns
+                shutil.copyfile(path, tmp_path)
+                bars.reindex(columns=columns).to_csv(
+                    tmp_path, mode="a", header=False, index=False
+                )
+            else:
+                bars.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write_meta(self, symbol: str, meta: dict):
+        meta_path = self._meta_path(symbol)
+        tmp_path = f"{meta_path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _remove_legacy_files(self, symbol: str):
+        # date-stamped full downloads written to the cache dir before the store existed
+        cache_dir = os.path.dirname(self.store_dir)
+        for path in glob.glob(
+            os.path.join(glob.escape(cache_dir), f"{glob.escape(symbol)}-YFin-data-*.csv")
+        ):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _normalize(bars: pd.DataFrame) -> pd.DataFrame:
+    """Bars with a yyyy-mm-dd Date column, sorted and unique by date."""
+    if bars is None or len(bars) == 0:
+        return pd.DataFrame(columns=[DATE_COLUMN, "Close"])
+    if DATE_COLUMN not in bars.columns:
+        bars = bars.reset_index()
+    bars = bars.copy()
+    bars[DATE_COLUMN] = pd.to_datetime(bars[DATE_COLUMN]).dt.strftime("%Y-%m-%d")
+    bars = bars.dropna(subset=["Close"])
+    return bars.drop_duplicates(DATE_COLUMN, keep="last").sort_values(DATE_COLUMN)
+
+
+def _moved(close: float, stored_close: float) -> bool:
+    return abs(float(close) - stored_close) > _ADJUSTMENT_TOLERANCE * max(
+        abs(stored_close), 1.0
+    )
+
+
+_stores: Dict[str, BarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_bar_store() -> BarStore:
+    """Process-wide bar store rooted in the configured data cache dir."""
+    store_dir = os.path.join(get_config()["data_cache_dir"], "bars")
+    with _stores_lock:
+        if store_dir not in _stores:
+            _stores[store_dir] = BarStore(store_dir)
+        return _stores[store_dir]
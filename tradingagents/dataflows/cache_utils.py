@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+def default_sizeof(value: Any) -> int:
+    """Approximate size of a cached value in bytes."""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache.
+
+    Entries are evicted oldest-first once either bound is exceeded:
+    max_entries caps the number of entries and max_bytes caps the summed
+    size of the values as reported by sizeof. A bound of None disables it.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                # never admit a value that would evict everything else
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.total_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries expire ttl seconds after being stored.
+
+    Expired entries read as misses through get but stay available through
+    get_entry until evicted, so callers can revalidate them (e.g. with HTTP
+    conditional requests) instead of fetching them again.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ):
+        super().__init__(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: sizeof(entry[0]),
+        )
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = super().get(key)
+        if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+            return default
+        return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[tuple]:
+        """(value, fresh) for key, whether or not it expired; None if absent."""
+        entry = super().get(key)
+        if entry is None:
+            return None
+        return entry[0], entry[1] is None or entry[1] >= time.monotonic()
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key, expiring after ttl seconds (default: self.ttl)."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        super().put(key, (value, expires_at))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = super().pop(key)
+        return default if entry is None else entry[0]
+
+
+class DiskCache:
+    """Persistent key-value cache with expiry and a bound on its size on disk.
+
+    Values are pickled into one file per key under directory, named after a
+    hash of the key. Entries older than ttl seconds read as misses and are
+    removed; once the files exceed max_bytes the least recently used ones
+    (by mtime, refreshed on every hit) are evicted. A bound of None disables it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self._files())
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.pkl")
+
+    def _files(self):
+        """(path, mtime, size) of every entry on disk."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+
+        if expires_at is not None and expires_at < time.time():
+            self._remove(path)
+            return default
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key, expiring after ttl seconds (default: self.ttl)."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+        payload = pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+
+        with self._lock:
+            try:
+                self.total_bytes -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self.total_bytes += len(payload)
+            if self.max_bytes is not None and self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def pop(self, key: Hashable):
+        self._remove(self._path(key))
+
+    def clear(self):
+        for path, _, _ in self._files():
+            self._remove(path)
+
+    def _remove(self, path: str):
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            self.total_bytes -= size
+
+    def _evict(self):
+        # rescan, the directory may be shared with other processes
+        files = sorted(self._files(), key=lambda entry: entry[1])
+        self.total_bytes = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one.
+
+    The first caller of do(key, fn) runs fn; callers arriving while it runs
+    wait for it and get its result (or exception) instead of running fn
+    again.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
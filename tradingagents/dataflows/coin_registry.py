@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from .config import get_config
+
+# Map common symbols to CoinGecko IDs; these win over the coin list, which
+# has many tokens sharing the symbols of the majors
+SYMBOL_TO_ID = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "USDC": "usd-coin",
+    "USDT": "tether",
+    "DAI": "dai",
+    "UNI": "uniswap",
+    "LINK": "chainlink",
+    "AAVE": "aave",
+    "COMP": "compound-governance-token",
+    "CRV": "curve-dao-token",
+    "SUSHI": "sushi",
+    "YFI": "yearn-finance",
+    "BAL": "balancer",
+    "SNX": "havven",
+    "MKR": "maker",
+    "REN": "republic-protocol",
+    "BAND": "band-protocol",
+    "ZRX": "0x",
+    "BAT": "basic-attention-token",
+    "REP": "augur",
+}
+
+# seconds to wait before retrying a failed coin list download
+_RETRY_AFTER = 300
+
+
+class CoinRegistry:
+    """Resolves token symbols, names, ids and contract addresses to CoinGecko ids.
+
+    The full CoinGecko coin list (with contract addresses per platform) is
+    downloaded once, stored as json under store_dir and downloaded again
+    when older than refresh_interval seconds. Lookups go through in-memory
+    indexes on id, symbol, name and contract address. When several coins
+    share a symbol or name the choice is deterministic: the SYMBOL_TO_ID
+    overrides first, then a coin whose id equals the query, then the
+    shortest id, then the lexicographically smallest one. An exact id
+    always wins over coins using it as their symbol, so "solana" stays
+    solana even though wrapped-solana trades as SOLANA.
+
+    Without a coin list (never downloaded and the download failing), ids are
+    resolved as before the registry existed: overrides, else the lowercased
+    query.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        fetch: Callable[[], List[Dict]],
+        refresh_interval: float = 24 * 3600,
+    ):
+        self.store_dir = store_dir
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.fetched_at = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._set_coins([])
+        self._load()
+
+    @property
+    def list_path(self) -> str:
+        return os.path.join(self.store_dir, "coins_list.json")
+
+    def _set_coins(self, coins: List[Dict]):
+        by_id, by_symbol, by_name, by_address = {}, {}, {}, {}
+        for coin in coins:
+            coin_id = coin["id"]
+            by_id[coin_id] = coin
+            by_symbol.setdefault(coin.get("symbol", "").lower(), []).append(coin_id)
+            by_name.setdefault(coin.get("name", "").lower(), []).append(coin_id)
+            for address in (coin.get("platforms") or {}).values():
+                if address:
+                    by_address.setdefault(address.lower(), []).append(coin_id)
+        self.by_id, self.by_symbol, self.by_name, self.by_address = (
+            by_id,
+            by_symbol,
+            by_name,
+            by_address,
+        )
+
+    def _load(self):
+        if not os.path.exists(self.list_path):
+            return
+        try:
+            with open(self.list_path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._set_coins(stored["coins"])
+        self.fetched_at = stored["fetched_at"]
+
+    def refresh(self) -> bool:
+        """Download the coin list now, returning whether it succeeded."""
+        try:
+            coins = self.fetch()
+        except Exception:
+            coins = None
+        if not isinstance(coins, list) or not coins:
+            self._retry_at = time.time() + _RETRY_AFTER
+            return False
+
+        fetched_at = time.time()
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{self.list_path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "w") as f:
+            json.dump({"fetched_at": fetched_at, "coins": coins}, f)
+        os.replace(tmp_path, self.list_path)
+        self._set_coins(coins)
+        self.fetched_at = fetched_at
+        return True
+
+    def _ensure_fresh(self):
+        now = time.time()
+        if self.fetched_at is not None and now - self.fetched_at < self.refresh_interval:
+            return
+        if now < self._retry_at:
+            return
+        with self._lock:
+            if self.fetched_at is None or time.time() - self.fetched_at >= self.refresh_interval:
+                self.refresh()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.by_id)
+
+    def _pick(self, query: str, candidates: List[str]) -> str:
+        return min(candidates, key=lambda coin_id: (coin_id != query, len(coin_id), coin_id))
+
+    def resolve(self, query: str) -> Optional[str]:
+        """CoinGecko id of a symbol, id, name or contract address, None if unknown."""
+        query = query.strip()
+        override = SYMBOL_TO_ID.get(query.upper())
+        if override is not None:
+            return override
+
+        self._ensure_fresh()
+        key = query.lower()
+        if not self.available:
+            return key
+        if key in self.by_address:
+            return self._pick(key, self.by_address[key])
+        if key in self.by_id:
+            return key
+        if key in self.by_symbol:
+            return self._pick(key, self.by_symbol[key])
+        if key in self.by_name:
+            return self._pick(key, self.by_name[key])
+        return None
+
+    def symbol(self, coin_id: str) -> Optional[str]:
+        """Upper-case symbol of a CoinGecko id, None if unknown."""
+        coin = self.by_id.get(coin_id)
+        return coin["symbol"].upper() if coin is not None else None
+
+
+_registries: Dict[str, CoinRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_coin_registry(fetch: Callable[[], List[Dict]]) -> CoinRegistry:
+    """Process-wide coin registry stored in the configured data cache dir.
+
+    fetch downloads the coin list; it is only used by the first caller.
+    """
+    config = get_config()
+    store_dir = os.path.join(config["data_cache_dir"], "coins")
+    with _registries_lock:
+        if store_dir not in _registries:
+            _registries[store_dir] = CoinRegistry(
+                store_dir,
+                fetch,
+                config.get("coin_list_refresh_interval", 24 * 3600),
+            )
+        return _registries[store_dir]
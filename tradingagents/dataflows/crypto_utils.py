@@ -3,13 +3,22 @@ Crypto-specific data utilities for TradingAgents
 Uses AgentKit and crypto price oracles for blockchain data
 """
 
-import requests
 import json
-from typing import Dict, List, Optional, Annotated
+from typing import Dict, List, Optional, Annotated, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 from pathlib import Path
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .cache_utils import TTLCache
+from .coin_registry import CoinRegistry, get_coin_registry
+from .http_utils import make_session
+from .indicators import compute_indicators
+from .streaming_indicators import StreamingIndicatorHub, get_streaming_hub
 
 # AgentKit imports
 try:
@@ -38,13 +47,72 @@ except ImportError:
 
 # Crypto price oracle APIs
 class CryptoPriceOracle:
-    """Crypto price oracle integration"""
-    
-    def __init__(self):
+    """Crypto price oracle integration
+
+    Requests go through one keep-alive session and successful responses are
+    cached per endpoint for the TTLs in ENDPOINT_TTLS. Expired responses that
+    came with an ETag or Last-Modified header are revalidated with a
+    conditional request, reusing the cached body on 304 Not Modified.
+    """
+
+    # seconds a response stays fresh, by endpoint
+    ENDPOINT_TTLS = {
+        "simple/price": 60,
+        "coins": 300,
+        "market_chart": 300,
+        "protocol": 600,
+        "coins/list": 24 * 3600,
+    }
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        pool_size: int = 10,
+    ):
         self.coingecko_api = "https://api.coingecko.com/api/v3"
         self.binance_api = "https://api.binance.com/api/v3"
         self.defillama_api = "https://api.llama.fi"
-        
+        self.ttls = {**self.ENDPOINT_TTLS, **(ttls or {})}
+        self.session = make_session(pool_size)
+        # cached responses are sized by their body length
+        self.cache = TTLCache(max_bytes=max_bytes, sizeof=lambda entry: entry[1])
+
+    def _get(self, url: str, params: Optional[Dict] = None, ttl: Optional[float] = None) -> Dict:
+        """GET a json resource through the response cache."""
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        headers = {}
+        stale = self.cache.get_entry(key)
+        if stale is not None:
+            _, _, etag, last_modified = stale[0]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(url, params=params, headers=headers, timeout=10)
+        if response.status_code == 304 and stale is not None:
+            self.cache.put(key, stale[0], ttl)
+            return stale[0][0]
+        response.raise_for_status()
+
+        data = response.json()
+        self.cache.put(
+            key,
+            (
+                data,
+                len(response.content),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            ),
+            ttl,
+        )
+        return data
+
     def get_token_price_coingecko(self, token_id: str, vs_currency: str = "usd") -> Dict:
         """Get token price from CoinGecko"""
         try:
@@ -56,12 +124,15 @@ class CryptoPriceOracle:
                 "include_market_cap": "true",
                 "include_24hr_vol": "true"
             }
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(url, params, self.ttls["simple/price"])
         except Exception as e:
             return {"error": f"CoinGecko API error: {str(e)}"}
     
+    def get_coins_list(self) -> List[Dict]:
+        """Get every CoinGecko coin with its contract addresses; raises on failure"""
+        url = f"{self.coingecko_api}/coins/list"
+        return self._get(url, {"include_platform": "true"}, self.ttls["coins/list"])
+    
     def get_token_market_data(self, token_id: str) -> Dict:
         """Get comprehensive market data from CoinGecko"""
         try:
@@ -74,9 +145,7 @@ class CryptoPriceOracle:
                 "developer_data": "true",
                 "sparkline": "false"
             }
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(url, params, self.ttls["coins"])
         except Exception as e:
             return {"error": f"CoinGecko market data error: {str(e)}"}
     
@@ -88,9 +157,7 @@ class CryptoPriceOracle:
                 "vs_currency": vs_currency,
                 "days": days
             }
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(url, params, self.ttls["market_chart"])
         except Exception as e:
             return {"error": f"CoinGecko history error: {str(e)}"}
     
@@ -98,65 +165,165 @@ class CryptoPriceOracle:
         """Get DeFi protocol data from DefiLlama"""
         try:
             url = f"{self.defillama_api}/protocol/{protocol}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(url, ttl=self.ttls["protocol"])
         except Exception as e:
             return {"error": f"DefiLlama API error: {str(e)}"}
 
+class AgentKitOnchainProvider:
+    """Onchain data source backed by the AgentKit action providers"""
+
+    def __init__(self):
+        self.agentkit = AgentKit()
+
+    def metadata(self, token_address: str, network: str) -> Dict:
+        return get_token_metadata(token_address, network)
+
+    def price(self, token_address: str, network: str) -> Dict:
+        return get_token_price(token_address, network)
+
+    def liquidity(self, token_address: str, network: str) -> Dict:
+        return get_liquidity_pool_data(token_address, network)
+
+    def holders(self, token_address: str, network: str) -> Dict:
+        return get_token_holders(token_address, network)
+
+    def supply(self, token_address: str, network: str) -> Dict:
+        return get_token_supply(token_address, network)
+
+    def transfers(self, token_address: str, network: str, limit: int = 100) -> Dict:
+        return get_token_transfers(token_address, network, limit=limit)
+
+    def dex_trades(self, token_address: str, network: str, limit: int = 50) -> Dict:
+        return get_dex_trades(token_address, network, limit=limit)
+
+
+class StubOnchainProvider:
+    """Offline onchain data source returning canned data after a fixed latency
+
+    latency is either seconds for every call or a dict of seconds by source
+    (metadata, price, liquidity, holders, supply, transfers, dex_trades);
+    sources listed in fail raise instead of answering. Used to benchmark and
+    test the onchain pipeline without AgentKit or network access.
+    """
+
+    def __init__(self, latency=0.1, fail=()):
+        self.latency = latency
+        self.fail = set(fail)
+
+    def _respond(self, source: str, data: Dict) -> Dict:
+        latency = self.latency.get(source, 0) if isinstance(self.latency, dict) else self.latency
+        time.sleep(latency)
+        if source in self.fail:
+            raise RuntimeError(f"stub {source} failure")
+        return data
+
+    def metadata(self, token_address: str, network: str) -> Dict:
+        return self._respond(
+            "metadata",
+            {"address": token_address, "network": network, "name": "Stub Token", "symbol": "STUB", "decimals": 18},
+        )
+
+    def price(self, token_address: str, network: str) -> Dict:
+        return self._respond("price", {"usd": 1.0})
+
+    def liquidity(self, token_address: str, network: str) -> Dict:
+        return self._respond(
+            "liquidity",
+            {"pools": [{"dex": "uniswap", "tvl": 1_000_000}, {"dex": "sushiswap", "tvl": 250_000}]},
+        )
+
+    def holders(self, token_address: str, network: str) -> Dict:
+        return self._respond(
+            "holders",
+            {
+                "total_supply": 1_000_000,
+                "holders": [{"address": f"0x{i:040x}", "percentage": 0.1 / (i + 1)} for i in range(20)],
+            },
+        )
+
+    def supply(self, token_address: str, network: str) -> Dict:
+        return self._respond("supply", {"total_supply": 1_000_000, "circulating_supply": 800_000})
+
+    def transfers(self, token_address: str, network: str, limit: int = 100) -> Dict:
+        return self._respond("transfers", {"transfers": [{"value": 10 * (i + 1)} for i in range(limit)]})
+
+    def dex_trades(self, token_address: str, network: str, limit: int = 50) -> Dict:
+        return self._respond("dex_trades", {"trades": [{"value": 5 * (i + 1)} for i in range(limit)]})
+
+
 class OnchainAnalytics:
-    """Onchain analytics using AgentKit and blockchain data"""
+    """Onchain analytics using AgentKit and blockchain data
+
+    provider is the onchain data source, by default AgentKit when installed.
+    get_token_onchain_data queries all sources concurrently, each bounded by
+    timeout seconds.
+    """
     
-    def __init__(self, network: str = "ethereum"):
+    def __init__(self, network: str = "ethereum", provider=None, timeout: float = 30):
         self.network = network
-        self.agentkit = AgentKit() if AGENTKIT_AVAILABLE else None
+        if provider is None and AGENTKIT_AVAILABLE:
+            provider = AgentKitOnchainProvider()
+        self.provider = provider
+        self.agentkit = getattr(provider, "agentkit", None)
+        self.timeout = timeout
         
     def get_token_onchain_data(self, token_address: str) -> Dict:
-        """Get comprehensive onchain data for a token"""
-        if not AGENTKIT_AVAILABLE:
+        """Get comprehensive onchain data for a token
+
+        Sources that fail or time out are left out of the result and reported
+        in its "errors" dict; "error" is only set when every source failed.
+        """
+        if self.provider is None:
             return {"error": "AgentKit not available"}
-            
-        try:
-            # Get token metadata
-            metadata = get_token_metadata(token_address, self.network)
-            
-            # Get price data
-            price_data = get_token_price(token_address, self.network)
-            
-            # Get liquidity data
-            liquidity_data = get_liquidity_pool_data(token_address, self.network)
-            
-            # Get holder data
-            holders_data = get_token_holders(token_address, self.network)
-            
-            # Get supply data
-            supply_data = get_token_supply(token_address, self.network)
-            
-            # Get recent transfers
-            transfers_data = get_token_transfers(token_address, self.network, limit=100)
-            
-            # Get DEX trades
-            dex_trades = get_dex_trades(token_address, self.network, limit=50)
-            
-            return {
-                "metadata": metadata,
-                "price": price_data,
-                "liquidity": liquidity_data,
-                "holders": holders_data,
-                "supply": supply_data,
-                "transfers": transfers_data,
-                "dex_trades": dex_trades
-            }
-        except Exception as e:
-            return {"error": f"Onchain data error: {str(e)}"}
+
+        calls = {
+            "metadata": (self.provider.metadata, {}),
+            "price": (self.provider.price, {}),
+            "liquidity": (self.provider.liquidity, {}),
+            "holders": (self.provider.holders, {}),
+            "supply": (self.provider.supply, {}),
+            "transfers": (self.provider.transfers, {"limit": 100}),
+            "dex_trades": (self.provider.dex_trades, {"limit": 50}),
+        }
+        # A thread cannot be stopped once its call has started, so every
+        # request gets its own workers: a call still hanging at the deadline
+        # keeps only its own thread busy until the provider returns, and never
+        # holds up later requests.
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="onchain")
+        futures = {
+            executor.submit(fn, token_address, self.network, **kwargs): name
+            for name, (fn, kwargs) in calls.items()
+        }
+        # all calls start together, so one deadline bounds each of them
+        done, _ = wait(futures, timeout=self.timeout)
+        executor.shutdown(wait=False)
+
+        results = {}
+        errors = {}
+        for future, name in futures.items():
+            if future not in done:
+                errors[name] = f"timed out after {self.timeout}s"
+            elif future.exception() is not None:
+                errors[name] = str(future.exception())
+            else:
+                results[name] = future.result()
+
+        # keep the order of the sources
+        onchain_data = {name: results[name] for name in calls if name in results}
+        onchain_data["errors"] = errors
+        if not results:
+            onchain_data["error"] = "Onchain data error: " + "; ".join(
+                f"{name}: {message}" for name, message in errors.items()
+            )
+        return onchain_data
     
     def analyze_liquidity_metrics(self, token_address: str) -> Dict:
         """Analyze liquidity pool metrics"""
-        if not AGENTKIT_AVAILABLE:
+        if self.provider is None:
             return {"error": "AgentKit not available"}
             
         try:
-            liquidity_data = get_liquidity_pool_data(token_address, self.network)
+            liquidity_data = self.provider.liquidity(token_address, self.network)
             
             # Calculate liquidity metrics
             total_liquidity = sum(pool.get("tvl", 0) for pool in liquidity_data.get("pools", []))
@@ -182,11 +349,11 @@ class OnchainAnalytics:
     
     def analyze_holder_metrics(self, token_address: str) -> Dict:
         """Analyze token holder metrics"""
-        if not AGENTKIT_AVAILABLE:
+        if self.provider is None:
             return {"error": "AgentKit not available"}
             
         try:
-            holders_data = get_token_holders(token_address, self.network)
+            holders_data = self.provider.holders(token_address, self.network)
             
             # Calculate holder metrics
             total_holders = len(holders_data.get("holders", []))
@@ -212,12 +379,12 @@ class OnchainAnalytics:
     
     def analyze_transaction_metrics(self, token_address: str) -> Dict:
         """Analyze transaction patterns"""
-        if not AGENTKIT_AVAILABLE:
+        if self.provider is None:
             return {"error": "AgentKit not available"}
             
         try:
-            transfers_data = get_token_transfers(token_address, self.network, limit=1000)
-            dex_trades = get_dex_trades(token_address, self.network, limit=500)
+            transfers_data = self.provider.transfers(token_address, self.network, limit=1000)
+            dex_trades = self.provider.dex_trades(token_address, self.network, limit=500)
             
             # Analyze transfer patterns
             transfers = transfers_data.get("transfers", [])
@@ -246,67 +413,161 @@ class OnchainAnalytics:
         except Exception as e:
             return {"error": f"Transaction analysis error: {str(e)}"}
 
+MARKET_DATA_PARTS = ("price", "market", "history")
+
+# technical analysis columns and the engine indicators computing them
+TECHNICAL_INDICATORS = {
+    "sma_20": "close_20_sma",
+    "sma_50": "close_50_sma",
+    "ema_12": "close_12_ema",
+    "ema_26": "close_26_ema",
+    "rsi": "rsi",
+    "bb_middle": "boll",
+    "bb_upper": "boll_ub",
+    "bb_lower": "boll_lb",
+    "macd": "macd",
+    "macd_signal": "macds",
+    "macd_histogram": "macdh",
+}
+
+
+# graph run the current tool call belongs to; langgraph copies the context
+# into the threads and tasks of a run, so it reaches every tool call
+_current_run: ContextVar[Optional[str]] = ContextVar("crypto_run", default=None)
+
+
+@contextmanager
+def crypto_run(run_id: str):
+    """Scope the crypto data memoized by CryptoDataProvider to run_id."""
+    token = _current_run.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run.reset(token)
+
+
 class CryptoDataProvider:
-    """Main crypto data provider combining multiple sources"""
+    """Main crypto data provider combining multiple sources
+
+    Meant to be long-lived: fetched sub-resources are memoized per run (see
+    crypto_run), so tools asking for the same token within a run share one
+    request per sub-resource while concurrent runs never share or clear
+    each other's data. Memoized data expires after memo_ttl seconds and at
+    most memo_max_entries sub-resources are kept.
+    """
     
-    def __init__(self, network: str = "ethereum"):
+    def __init__(
+        self,
+        network: str = "ethereum",
+        price_oracle: Optional[CryptoPriceOracle] = None,
+        onchain_analytics: Optional["OnchainAnalytics"] = None,
+        onchain_timeout: float = 30,
+        streaming_hub: Optional[StreamingIndicatorHub] = None,
+        coin_registry: Optional[CoinRegistry] = None,
+        memo_ttl: Optional[float] = 30 * 60,
+        memo_max_entries: Optional[int] = 1024,
+    ):
         self.network = network
-        self.price_oracle = CryptoPriceOracle()
-        self.onchain_analytics = OnchainAnalytics(network)
-        
-    def get_crypto_market_data(self, token_symbol: str, token_address: str = None) -> Dict:
-        """Get comprehensive crypto market data"""
-        # Map common symbols to CoinGecko IDs
-        symbol_to_id = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "USDC": "usd-coin",
-            "USDT": "tether",
-            "DAI": "dai",
-            "UNI": "uniswap",
-            "LINK": "chainlink",
-            "AAVE": "aave",
-            "COMP": "compound-governance-token",
-            "CRV": "curve-dao-token",
-            "SUSHI": "sushi",
-            "YFI": "yearn-finance",
-            "BAL": "balancer",
-            "SNX": "havven",
-            "MKR": "maker",
-            "REN": "republic-protocol",
-            "BAND": "band-protocol",
-            "ZRX": "0x",
-            "BAT": "basic-attention-token",
-            "REP": "augur",
-        }
-        
-        token_id = symbol_to_id.get(token_symbol.upper(), token_symbol.lower())
-        
+        self.price_oracle = price_oracle or CryptoPriceOracle()
+        self.coin_registry = coin_registry or get_coin_registry(
+            self.price_oracle.get_coins_list
+        )
+        self.streaming_hub = streaming_hub or get_streaming_hub()
+        self._onchain_analytics = onchain_analytics
+        self.onchain_timeout = onchain_timeout
+        self._memo = TTLCache(ttl=memo_ttl, max_entries=memo_max_entries)
+
+    @property
+    def onchain_analytics(self) -> "OnchainAnalytics":
+        # built on first use, constructing it may set up AgentKit
+        if self._onchain_analytics is None:
+            self._onchain_analytics = OnchainAnalytics(
+                self.network, timeout=self.onchain_timeout
+            )
+        return self._onchain_analytics
+
+    def clear_memo(self):
+        """Forget the sub-resources fetched so far, by all runs."""
+        self._memo.clear()
+
+    def _memoized(self, key, fetch):
+        key = (_current_run.get(), *key)
+        value = self._memo.get(key)
+        if value is not None:
+            return value
+        value = fetch()
+        if not (isinstance(value, dict) and "error" in value):
+            self._memo.put(key, value)
+        return value
+
+    def get_crypto_market_data(
+        self,
+        token_symbol: str,
+        token_address: str = None,
+        include: Tuple[str, ...] = MARKET_DATA_PARTS,
+    ) -> Dict:
+        """Get comprehensive crypto market data
+
+        include selects the sub-resources to fetch: "price" (price_data),
+        "market" (market_data) and "history" (30 day price_history); only
+        the selected keys are present in the result.
+        """
+        token_id = self.coin_registry.resolve(token_symbol)
+
+        result = {"symbol": token_symbol, "token_id": token_id}
+        if token_id is None:
+            # no request for ids CoinGecko does not know
+            parts = {"price": "price_data", "market": "market_data", "history": "price_history"}
+            for part, key in parts.items():
+                if part in include:
+                    result[key] = {"error": f"Unknown token: {token_symbol}"}
+            result["onchain_data"] = {}
+            return result
+
         # Get price data
-        price_data = self.price_oracle.get_token_price_coingecko(token_id)
-        market_data = self.price_oracle.get_token_market_data(token_id)
-        price_history = self.price_oracle.get_token_price_history(token_id, days=30)
-        
+        if "price" in include:
+            result["price_data"] = self._memoized(
+                ("price", token_id),
+                lambda: self.price_oracle.get_token_price_coingecko(token_id),
+            )
+        if "market" in include:
+            result["market_data"] = self._memoized(
+                ("market", token_id),
+                lambda: self.price_oracle.get_token_market_data(token_id),
+            )
+        if "history" in include:
+            result["price_history"] = self._memoized(
+                ("history", token_id, 30),
+                lambda: self.price_oracle.get_token_price_history(token_id, days=30),
+            )
+
         # Get onchain data if address provided
         onchain_data = {}
         if token_address:
-            onchain_data = self.onchain_analytics.get_token_onchain_data(token_address)
-        
-        return {
-            "symbol": token_symbol,
-            "token_id": token_id,
-            "price_data": price_data,
-            "market_data": market_data,
-            "price_history": price_history,
-            "onchain_data": onchain_data
-        }
+            onchain_data = self._memoized(
+                ("onchain", self.network, token_address),
+                lambda: self.onchain_analytics.get_token_onchain_data(token_address),
+            )
+        result["onchain_data"] = onchain_data
+
+        return result
     
     def get_crypto_technical_analysis(self, token_symbol: str) -> Dict:
         """Get technical analysis for crypto"""
-        token_id = token_symbol.lower()
+        token_id = self.coin_registry.resolve(token_symbol)
+        if token_id is None:
+            return {"error": f"Unknown token: {token_symbol}"}
+        
+        # Live indicators are read as they are when the token is streamed
+        live = self.streaming_hub.snapshot(token_id)
+        if live is not None:
+            return live
         
         # Get price history for technical analysis
-        price_history = self.price_oracle.get_token_price_history(token_id, days=90)
+        price_history = self._memoized(
+            ("history", token_id, 90),
+            lambda: self.price_oracle.get_token_price_history(token_id, days=90),
+        )
         
         if "error" in price_history:
             return price_history
@@ -321,29 +582,13 @@ class CryptoDataProvider:
         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
         df.set_index("timestamp", inplace=True)
         
-        # Calculate moving averages
-        df["sma_20"] = df["price"].rolling(window=20).mean()
-        df["sma_50"] = df["price"].rolling(window=50).mean()
-        df["ema_12"] = df["price"].ewm(span=12).mean()
-        df["ema_26"] = df["price"].ewm(span=26).mean()
-        
-        # Calculate RSI
-        delta = df["price"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["rsi"] = 100 - (100 / (1 + rs))
-        
-        # Calculate Bollinger Bands
-        df["bb_middle"] = df["price"].rolling(window=20).mean()
-        bb_std = df["price"].rolling(window=20).std()
-        df["bb_upper"] = df["bb_middle"] + (bb_std * 2)
-        df["bb_lower"] = df["bb_middle"] - (bb_std * 2)
-        
-        # Calculate MACD
-        df["macd"] = df["ema_12"] - df["ema_26"]
-        df["macd_signal"] = df["macd"].ewm(span=9).mean()
-        df["macd_histogram"] = df["macd"] - df["macd_signal"]
+        # Calculate moving averages, RSI, Bollinger Bands and MACD with the
+        # shared indicator engine, as for equities
+        indicators = compute_indicators(
+            {"close": df["price"].to_numpy()}, list(TECHNICAL_INDICATORS.values())
+        )
+        for column, indicator in TECHNICAL_INDICATORS.items():
+            df[column] = indicators[indicator]
         
         # Get latest values
         latest = df.iloc[-1]
@@ -364,7 +609,10 @@ class CryptoDataProvider:
     
     def get_defi_protocol_analysis(self, protocol: str) -> Dict:
         """Analyze DeFi protocol data"""
-        protocol_data = self.price_oracle.get_defi_protocol_data(protocol)
+        protocol_data = self._memoized(
+            ("protocol", protocol),
+            lambda: self.price_oracle.get_defi_protocol_data(protocol),
+        )
         
         if "error" in protocol_data:
             return protocol_data
@@ -1,5 +1,189 @@
 import json
 import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Hashable, Iterable, List, Optional
+
+from .cache_utils import LRUCache
+from .config import get_config
+
+
+class FinnhubData:
+    """In-memory Finnhub records of one file with the date keys pre-sorted.
+
+    Range queries bisect the sorted keys and return the matching entries in
+    the order of the source file.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        ordered = sorted((key, position) for position, key in enumerate(data))
+        self.keys = [key for key, _ in ordered]
+        self.positions = [position for _, position in ordered]
+        self.nbytes = 0
+
+    @classmethod
+    def from_json(cls, path: str) -> "FinnhubData":
+        with open(path, "r") as f:
+            data = cls(json.load(f))
+        data.nbytes = os.path.getsize(path)
+        return data
+
+    def range(self, start_date: str, end_date: str) -> dict:
+        lo = bisect_left(self.keys, start_date)
+        hi = bisect_right(self.keys, end_date)
+        matches = sorted(zip(self.positions[lo:hi], self.keys[lo:hi]))
+
+        filtered_data = {}
+        for _, key in matches:
+            value = self.data[key]
+            if len(value) > 0:
+                filtered_data[key] = value
+        return filtered_data
+
+
+class FinnhubSQLiteData:
+    """Finnhub records of one file converted to an indexed SQLite table.
+
+    Used for large histories so the records never have to be held in memory;
+    a range query is an index scan over the date column.
+    """
+
+    nbytes = 0
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def convert(cls, json_path: str, sqlite_path: str) -> "FinnhubSQLiteData":
+        """Write the records of a Finnhub json file into a SQLite file."""
+        with open(json_path, "r") as f:
+            data = json.load(f)
+
+        tmp_path = f"{sqlite_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TABLE records (date TEXT, position INTEGER, payload TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO records VALUES (?, ?, ?)",
+                (
+                    (key, position, json.dumps(value))
+                    for position, (key, value) in enumerate(data.items())
+                    if len(value) > 0
+                ),
+            )
+            conn.execute("CREATE INDEX records_date ON records (date)")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, sqlite_path)
+        return cls(sqlite_path)
+
+    def range(self, start_date: str, end_date: str) -> dict:
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT date, payload FROM records WHERE date BETWEEN ? AND ? ORDER BY position",
+                (start_date, end_date),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {key: json.loads(payload) for key, payload in rows}
+
+
+class FinnhubStore:
+    """Process-wide access to the Finnhub files on disk.
+
+    Parsed files of hot tickers stay in an LRU bounded by max_tickers and
+    max_bytes (size of the source json). Files larger than sqlite_min_bytes
+    are converted once into SQLite under sqlite_dir and queried from there.
+    A file is reloaded whenever its mtime or size changes.
+    """
+
+    def __init__(
+        self,
+        max_tickers: int = 64,
+        max_bytes: int = None,
+        sqlite_dir: str = None,
+        sqlite_min_bytes: int = None,
+    ):
+        self.cache = LRUCache(
+            max_entries=max_tickers, max_bytes=max_bytes, sizeof=lambda d: d.nbytes
+        )
+        self.sqlite_dir = sqlite_dir
+        self.sqlite_min_bytes = sqlite_min_bytes
+        self._lock = threading.Lock()
+
+    def get(self, path: str):
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+            if (
+                self.sqlite_dir is not None
+                and self.sqlite_min_bytes is not None
+                and stat.st_size >= self.sqlite_min_bytes
+            ):
+                data = self._get_sqlite(path, stat)
+            else:
+                data = FinnhubData.from_json(path)
+            self.cache.put(key, data)
+            return data
+
+    def _get_sqlite(self, path: str, stat) -> FinnhubSQLiteData:
+        data_type = os.path.basename(os.path.dirname(path))
+        stem = os.path.splitext(os.path.basename(path))[0]
+        sqlite_path = os.path.join(
+            self.sqlite_dir,
+            data_type,
+            f"{stem}-{stat.st_mtime_ns}-{stat.st_size}.sqlite",
+        )
+        if os.path.exists(sqlite_path):
+            return FinnhubSQLiteData(sqlite_path)
+        os.makedirs(os.path.dirname(sqlite_path), exist_ok=True)
+        data = FinnhubSQLiteData.convert(path, sqlite_path)
+
+        # drop the conversions of older versions of the same file
+        for entry in os.listdir(os.path.dirname(sqlite_path)):
+            if (
+                entry.endswith(".sqlite")
+                and entry != os.path.basename(sqlite_path)
+                and entry.rsplit("-", 2)[0] == stem
+            ):
+                os.remove(os.path.join(os.path.dirname(sqlite_path), entry))
+        return data
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_finnhub_store() -> FinnhubStore:
+    """Finnhub store configured from the current config."""
+    config = get_config()
+    settings = (
+        config.get("finnhub_cache_max_tickers", 64),
+        config.get("finnhub_cache_max_bytes"),
+        os.path.join(config["data_cache_dir"], "finnhub_sqlite"),
+        config.get("finnhub_sqlite_min_bytes"),
+    )
+    with _stores_lock:
+        if settings not in _stores:
+            _stores[settings] = FinnhubStore(*settings)
+        return _stores[settings]
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -25,12 +209,62 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
-
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    return get_finnhub_store().get(data_path).range(start_date, end_date)
+
+
+def freeze(value) -> Hashable:
+    """Hashable canonical form of a json value (dicts compare regardless of key order)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def unique_entries(
+    data: dict, key: Callable[[dict], Hashable] = freeze
+) -> List[dict]:
+    """Entries of a date -> entries mapping with duplicates removed.
+
+    Duplicates are detected through a hashable key (by default the frozen
+    entry itself), keeping the first occurrence in date order.
+    """
+    seen = set()
+    entries = []
+    for day_entries in data.values():
+        for entry in day_entries:
+            entry_key = key(entry)
+            if entry_key not in seen:
+                seen.add(entry_key)
+                entries.append(entry)
+    return entries
+
+
+def abs_share_change(entry: dict) -> float:
+    """Absolute share change of an insider entry, 0 when missing or malformed."""
+    try:
+        return abs(float(entry.get("change") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def format_entries(
+    entries: Iterable[dict],
+    formatter: Callable[[dict], str],
+    max_records: Optional[int] = None,
+    rank: Callable[[dict], float] = abs_share_change,
+) -> str:
+    """Render entries in a single join, capped at max_records.
+
+    When there are more entries than max_records, only the top max_records by
+    rank (by default the absolute share change) are rendered, largest first,
+    followed by a note on how many were left out.
+    """
+    entries = list(entries)
+    note = ""
+    if max_records is not None and len(entries) > max_records:
+        total = len(entries)
+        entries = sorted(entries, key=rank, reverse=True)[:max_records]
+        note = f"Showing the {max_records} of {total} entries with the largest absolute share change.\n\n"
+    return "".join(formatter(entry) for entry in entries) + note
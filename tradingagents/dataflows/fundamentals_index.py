@@ -0,0 +1,167 @@
+import os
+import pickle
+import shutil
+import threading
+import uuid
+from bisect import bisect_right
+from typing import Annotated, Dict, Optional
+
+import pandas as pd
+
+from .cache_utils import LRUCache
+from .config import get_config
+
+_INDEX_FILE = "index.pkl"
+_BLOCKS_FILE = "blocks.bin"
+# bumped when the index layout or contents change, so stale indexes are rebuilt
+_FORMAT_VERSION = 2
+
+
+def _epoch_days(dates: pd.Series) -> list:
+    return (dates.values.astype("datetime64[D]").astype("int64")).tolist()
+
+
+class FundamentalsIndex:
+    """Point-in-time index over one SimFin statement file.
+
+    Rows are partitioned by ticker and sorted by Publish Date. Each ticker's
+    rows are pickled as an independent block of blocks.bin, and index.pkl maps
+    a ticker to the byte range of its block plus its sorted publish dates, so
+    answering a query only reads the small index and one block.
+    """
+
+    def __init__(self, path: str, max_cached_blocks: int = 256):
+        self.path = path
+        self._index: Optional[Dict[str, tuple]] = None
+        self._blocks = LRUCache(max_entries=max_cached_blocks)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, csv_path: str, path: str) -> "FundamentalsIndex":
+        """Parse a SimFin csv once and write its index to path."""
+        df = pd.read_csv(csv_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # unpublished rows never match a point-in-time query
+        df = df.dropna(subset=["Publish Date"])
+
+        # stable sort so rows sharing a publish date keep their file order
+        df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_dir = f"{path}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(tmp_dir)
+        try:
+            index = {}
+            with open(os.path.join(tmp_dir, _BLOCKS_FILE), "wb") as f:
+                for ticker, block in df.groupby("Ticker", sort=False):
+                    payload = pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL)
+                    index[ticker] = (
+                        f.tell(),
+                        len(payload),
+                        _epoch_days(block["Publish Date"]),
+                    )
+                    f.write(payload)
+
+            with open(os.path.join(tmp_dir, _INDEX_FILE), "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            try:
+                os.rename(tmp_dir, path)
+            except OSError:
+                # another process built the same index first
+                if not os.path.exists(os.path.join(path, _INDEX_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return cls(path)
+
+    @property
+    def index(self) -> Dict[str, tuple]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    with open(os.path.join(self.path, _INDEX_FILE), "rb") as f:
+                        self._index = pickle.load(f)
+        return self._index
+
+    def _block(self, ticker: str) -> pd.DataFrame:
+        block = self._blocks.get(ticker)
+        if block is None:
+            offset, length, _ = self.index[ticker]
+            with open(os.path.join(self.path, _BLOCKS_FILE), "rb") as f:
+                f.seek(offset)
+                block = pickle.loads(f.read(length))
+            self._blocks.put(ticker, block)
+        return block
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Latest statement of ticker published on or before curr_date, if any."""
+        entry = self.index.get(ticker)
+        if entry is None:
+            return None
+
+        publish_days = entry[2]
+        curr_day = _epoch_days(
+            pd.Series([pd.to_datetime(curr_date, utc=True).normalize()])
+        )[0]
+        position = bisect_right(publish_days, curr_day) - 1
+        if position < 0:
+            return None
+
+        # same tie-breaking as idxmax: the first row carrying the latest date
+        while position > 0 and publish_days[position - 1] == publish_days[position]:
+            position -= 1
+
+        return self._block(ticker).iloc[position]
+
+
+_indexes: Dict[str, tuple] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_fundamentals_index(
+    csv_path: Annotated[str, "path of a SimFin statement csv"],
+) -> FundamentalsIndex:
+    """Index for a SimFin csv, built on first use and rebuilt when the csv changes."""
+    stat = os.stat(csv_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _indexes.get(csv_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _indexes_lock:
+        cached = _indexes.get(csv_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        index_dir = os.path.join(get_config()["data_cache_dir"], "fundamentals_index")
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        path = os.path.join(
+            index_dir, f"{stem}-{_FORMAT_VERSION}-{version[0]}-{version[1]}"
+        )
+
+        if os.path.exists(os.path.join(path, _INDEX_FILE)):
+            index = FundamentalsIndex(path)
+        else:
+            index = FundamentalsIndex.build(csv_path, path)
+            for entry in os.listdir(index_dir):
+                if (
+                    entry.startswith(f"{stem}-")
+                    and ".tmp-" not in entry
+                    and os.path.join(index_dir, entry) != path
+                    and entry[len(stem) + 1 :].replace("-", "").isdigit()
+                ):
+                    shutil.rmtree(os.path.join(index_dir, entry), ignore_errors=True)
+
+        _indexes[csv_path] = (version, index)
+        return index
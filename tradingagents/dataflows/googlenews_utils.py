@@ -1,9 +1,8 @@
 import json
-import requests
+import os
+import threading
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-import random
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -11,6 +10,51 @@ from tenacity import (
     retry_if_exception_type,
     retry_if_result,
 )
+from .cache_utils import DiskCache
+from .config import get_config
+from .http_utils import TokenBucket, make_session
+
+_session = None
+_limiter = None
+_page_cache = None
+_state_lock = threading.Lock()
+
+
+def get_session():
+    """Keep-alive session shared by all Google News requests."""
+    global _session
+    with _state_lock:
+        if _session is None:
+            _session = make_session(get_config().get("google_news_max_workers", 3))
+        return _session
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Token bucket shared by all threads fetching Google News pages."""
+    global _limiter
+    with _state_lock:
+        if _limiter is None:
+            config = get_config()
+            _limiter = TokenBucket(
+                config.get("google_news_requests_per_second", 0.25),
+                config.get("google_news_burst", 1),
+            )
+        return _limiter
+
+
+def get_page_cache() -> DiskCache:
+    """On-disk cache of parsed result pages in the configured data cache dir."""
+    global _page_cache
+    config = get_config()
+    directory = os.path.join(config["data_cache_dir"], "google_news")
+    with _state_lock:
+        if _page_cache is None or _page_cache.directory != directory:
+            _page_cache = DiskCache(
+                directory,
+                ttl=config.get("google_news_cache_ttl"),
+                max_bytes=config.get("google_news_cache_max_bytes"),
+            )
+        return _page_cache
 
 
 def is_rate_limited(response):
@@ -25,12 +69,70 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    # Wait for the shared rate budget before each request to avoid detection
+    get_rate_limiter().acquire()
+    response = get_session().get(url, headers=headers, timeout=30)
     return response
 
 
+def parse_results(soup):
+    """News results listed on one page of Google News search results."""
+    news_results = []
+    for el in soup.select("div.SoaBEf"):
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    return news_results
+
+
+def fetch_page(query, start_date, end_date, page, headers):
+    """
+    Results of one page of a search, and whether a next page exists.
+    Pages are served from the page cache when they were fetched before.
+    start_date / end_date: str - dates in the format mm/dd/yyyy
+    """
+    cache = get_page_cache()
+    key = ("google_news", query, start_date, end_date, page)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    offset = page * 10
+    url = (
+        f"https://www.google.com/search?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={offset}"
+    )
+
+    response = make_request(url, headers)
+    soup = BeautifulSoup(response.content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+
+    # Check for the "Next" link (pagination)
+    has_next = bool(results_on_page) and soup.find("a", id="pnnext") is not None
+    result = (parse_results(soup), bool(results_on_page), has_next)
+
+    if response.status_code == 200:
+        cache.put(key, result)
+    return result
+
+
 def getNewsData(query, start_date, end_date):
     """
     Scrape Google News search results for a given query and date range.
@@ -53,56 +155,26 @@ def getNewsData(query, start_date, end_date):
         )
     }
 
+    # Pages are fetched one at a time: requests are spaced out by the shared
+    # rate limiter anyway, and a page requested ahead of the last one would
+    # spend a token of the budget for nothing.
     news_results = []
     page = 0
     while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
         try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
-
+            results, found, has_next = fetch_page(
+                query, start_date, end_date, page, headers
+            )
         except Exception as e:
             print(f"Failed after multiple retries: {e}")
             break
 
+        if not found:
+            break  # No more results found
+        news_results.extend(results)
+
+        if not has_next:
+            break
+        page += 1
+
     return news_results
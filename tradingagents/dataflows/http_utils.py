@@ -0,0 +1,44 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to capacity; acquire
+    blocks until a token is available. Waiting callers reserve their token
+    up front, so concurrent threads are spaced out instead of racing.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """requests session keeping up to pool_size connections alive per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
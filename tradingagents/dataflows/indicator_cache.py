@@ -0,0 +1,116 @@
+import os
+import re
+import shutil
+import threading
+import uuid
+from typing import Dict, Optional
+
+import numpy as np
+
+from .cache_utils import LRUCache
+from .config import get_config
+
+DAYS_KEY = "__days__"
+
+
+def get_source_version(path: str) -> str:
+    """Version tag of a price file, derived from its name, mtime and size.
+
+    Any rewrite of the file changes the tag, which invalidates every
+    indicator series cached for it.
+    """
+    stat = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+class IndicatorCache:
+    """Two-tier cache for indicator series computed from a price file.
+
+    Series are keyed by (symbol, indicator, source version). The first tier
+    is an in-process LRU bounded by the total size of the cached arrays,
+    the second a directory of .npy files that survives across processes:
+
+        {cache_dir}/{symbol}/{source version}/{indicator}.npy
+
+    Writing a new source version removes the older versions of the symbol.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, indicator: str, version: str) -> str:
+        return os.path.join(
+            self.cache_dir, _safe_name(symbol), version, f"{_safe_name(indicator)}.npy"
+        )
+
+    def get(self, symbol: str, indicator: str, version: str) -> Optional[np.ndarray]:
+        key = (symbol, indicator, version)
+        series = self.memory.get(key)
+        if series is not None:
+            return series
+
+        path = self._path(symbol, indicator, version)
+        if not os.path.exists(path):
+            return None
+        try:
+            series = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        self.memory.put(key, series)
+        return series
+
+    def put(self, symbol: str, indicator: str, version: str, series: np.ndarray):
+        series = np.asarray(series)
+        self.memory.put((symbol, indicator, version), series)
+        if series.dtype == object:
+            # object arrays cannot be stored without pickling, keep them in memory only
+            return
+
+        path = self._path(symbol, indicator, version)
+        with self._lock:
+            self._remove_stale_versions(symbol, version)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{uuid.uuid4().hex}.npy"
+            np.save(tmp_path, series, allow_pickle=False)
+            os.replace(tmp_path, path)
+
+    def _remove_stale_versions(self, symbol: str, version: str):
+        symbol_dir = os.path.join(self.cache_dir, _safe_name(symbol))
+        if not os.path.isdir(symbol_dir):
+            return
+        stem = version.rsplit("-", 2)[0]
+        for entry in os.listdir(symbol_dir):
+            if entry != version and entry.rsplit("-", 2)[0] == stem:
+                shutil.rmtree(os.path.join(symbol_dir, entry), ignore_errors=True)
+
+    def get_many(self, symbol: str, indicators, version: str) -> Dict[str, np.ndarray]:
+        """Cached series for the given indicators, skipping the misses."""
+        found = {}
+        for indicator in indicators:
+            series = self.get(symbol, indicator, version)
+            if series is not None:
+                found[indicator] = series
+        return found
+
+
+_caches: Dict[str, IndicatorCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Process-wide indicator cache rooted in the configured data cache dir."""
+    config = get_config()
+    cache_dir = os.path.join(config["data_cache_dir"], "indicator_cache")
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = IndicatorCache(
+                cache_dir, max_bytes=config.get("indicator_cache_max_bytes")
+            )
+        return _caches[cache_dir]
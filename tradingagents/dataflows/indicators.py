@@ -0,0 +1,367 @@
+"""
+Vectorized technical-indicator engine shared by the equity and crypto tools.
+
+Indicators follow the semantics of stockstats (min_periods=1 rolling windows,
+adjusted exponential averages, Wilder smoothing for RSI and ATR, typical
+price for VWMA and MFI) and are named the same way, e.g. close_50_sma, rsi,
+rsi_6, macd, boll_ub, atr_20. Every input is converted once to a contiguous
+float64 array and all requested indicators are computed in one call.
+"""
+
+import re
+import warnings
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# rows of sliding windows materialized at once by the rolling reductions
+_ROLLING_CHUNK_ELEMENTS = 1 << 22
+
+# largest exponent kept in a chunk of the cumulative EWM, well inside float64
+_EWM_MAX_EXPONENT = 690.0
+
+BOLL_STD_TIMES = 2
+
+
+def as_float_array(values) -> np.ndarray:
+    """Contiguous float64 copy-free view of values where possible."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _rolling_reduce(x: np.ndarray, window: int, reduce: Callable) -> np.ndarray:
+    """Apply reduce(windows) to every trailing window of x, partial ones included.
+
+    Windows are NaN-padded at the start (min_periods=1) and processed in
+    chunks of rows so memory stays bounded for long series.
+    """
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    padded = np.concatenate([np.full(window - 1, np.nan), x])
+    chunk = max(1, _ROLLING_CHUNK_ELEMENTS // window)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            windows = np.lib.stride_tricks.sliding_window_view(
+                padded[start : stop + window - 1], window
+            )
+            out[start:stop] = reduce(windows)
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over window rows, NaN only where the window holds no value."""
+
+    def reduce(windows):
+        total = np.nansum(windows, axis=1)
+        total[np.isnan(windows).all(axis=1)] = np.nan
+        return total
+
+    return _rolling_reduce(x, window, reduce)
+
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average with min_periods=1."""
+    return _rolling_reduce(x, window, lambda windows: np.nanmean(windows, axis=1))
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Sample (ddof=1) moving standard deviation with min_periods=1."""
+    return _rolling_reduce(
+        x, window, lambda windows: np.nanstd(windows, axis=1, ddof=1)
+    )
+
+
+def ewm_mean(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Adjusted exponentially weighted mean (pandas ewm(adjust=True, ignore_na=False)).
+
+    y[t] = sum_i (1-alpha)^(t-i) x[i] / sum_i (1-alpha)^(t-i) over the valid x[i].
+    Both sums are evaluated with cumulative sums of rescaled terms, in chunks
+    short enough for the rescaling (1-alpha)^-k to stay finite; the running
+    sums are carried from one chunk to the next.
+    """
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    valid = ~np.isnan(x)
+    values = np.where(valid, x, 0.0)
+    weights = valid.astype(np.float64)
+    decay = 1.0 - alpha
+
+    if decay <= 0.0:
+        # no memory: each value stands alone, gaps keep the last value
+        out[:] = np.where(valid, x, np.nan)
+        return _forward_fill(out)
+
+    chunk = max(1, min(n, int(_EWM_MAX_EXPONENT / -np.log(decay))))
+    steps = np.arange(chunk, dtype=np.float64)
+    grow = decay ** -steps
+    shrink = decay ** steps
+
+    num_prev = 0.0
+    den_prev = 0.0
+    for start in range(0, n, chunk):
+        stop = min(n, start + chunk)
+        size = stop - start
+        carry = shrink[:size] * decay
+        num = shrink[:size] * np.cumsum(values[start:stop] * grow[:size]) + carry * num_prev
+        den = shrink[:size] * np.cumsum(weights[start:stop] * grow[:size]) + carry * den_prev
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[start:stop] = num / den
+        num_prev = num[-1]
+        den_prev = den[-1]
+    return out
+
+
+def _forward_fill(x: np.ndarray) -> np.ndarray:
+    idx = np.where(~np.isnan(x), np.arange(len(x)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    filled = x[idx]
+    filled[np.isnan(x) & (np.cumsum(~np.isnan(x)) == 0)] = np.nan
+    return filled
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average over span periods (alpha = 2 / (span + 1))."""
+    return ewm_mean(x, 2.0 / (span + 1.0))
+
+
+def smma(x: np.ndarray, window: int) -> np.ndarray:
+    """Smoothed (Wilder) moving average (alpha = 1 / window)."""
+    return ewm_mean(x, 1.0 / window)
+
+
+def _diff(x: np.ndarray) -> np.ndarray:
+    diff = np.zeros_like(x)
+    diff[1:] = np.diff(x)
+    return diff
+
+
+def _fill_zero(x: np.ndarray) -> np.ndarray:
+    return np.nan_to_num(x, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+
+def typical_price(prices: Dict[str, np.ndarray]) -> np.ndarray:
+    """amount / volume when an amount column exists, (high + low + close) / 3 otherwise."""
+    if "amount" in prices:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return prices["amount"] / prices["volume"]
+    return (prices["close"] + prices["high"] + prices["low"]) / 3.0
+
+
+def true_range(prices: Dict[str, np.ndarray]) -> np.ndarray:
+    close = prices["close"]
+    prev_close = np.empty_like(close)
+    if len(close):
+        prev_close[0] = close[0]
+        prev_close[1:] = close[:-1]
+    high = prices["high"]
+    low = prices["low"]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.nan_to_num(tr, copy=False)
+
+
+# --- indicator implementations: (prices, column, windows) -> {output name suffix: series}
+
+
+def _compute_sma(prices, column, windows):
+    return {"": sma(prices[column], windows[0])}
+
+
+def _compute_ema(prices, column, windows):
+    return {"": ema(prices[column], windows[0])}
+
+
+def _compute_rsi(prices, column, windows):
+    diff = _diff(prices["close"])
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    up_smma = smma(up, windows[0])
+    down_smma = smma(down, windows[0])
+    total = up_smma + down_smma
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(total != 0, 100 * (up_smma / total), 50.0)
+    if len(rsi):
+        rsi[0] = 50.0
+    return {"": _fill_zero(rsi)}
+
+
+def _compute_macd(prices, column, windows):
+    short_window, long_window, signal_window = windows
+    close = prices["close"]
+    macd = ema(close, short_window) - ema(close, long_window)
+    signal = ema(macd, signal_window)
+    return {"": macd, "s": signal, "h": macd - signal}
+
+
+def _compute_boll(prices, column, windows):
+    close = prices["close"]
+    middle = sma(close, windows[0])
+    width = BOLL_STD_TIMES * rolling_std(close, windows[0])
+    return {"": middle, "_ub": middle + width, "_lb": middle - width}
+
+
+def _compute_atr(prices, column, windows):
+    return {"": smma(true_range(prices), windows[0])}
+
+
+def _compute_vwma(prices, column, windows):
+    volume = prices["volume"]
+    tpv = rolling_sum(volume * typical_price(prices), windows[0])
+    vol = rolling_sum(volume, windows[0])
+    out = np.zeros_like(tpv)
+    np.divide(tpv, vol, out=out, where=vol != 0)
+    return {"": out}
+
+
+def _compute_mfi(prices, column, windows):
+    window = windows[0]
+    tp = typical_price(prices)
+    raw_money_flow = tp * prices["volume"]
+    tp_diff = _diff(tp)
+    pos_flow = np.where(tp_diff > 0, raw_money_flow, 0.0)
+    neg_flow = np.where(tp_diff < 0, raw_money_flow, 0.0)
+
+    # plain cumulative sums, as stockstats computes this one
+    def trailing_sum(flow):
+        out = np.cumsum(flow)
+        out[window:] = out[window:] - out[:-window].copy()
+        return out
+
+    pos_sum = trailing_sum(pos_flow)
+    neg_sum = trailing_sum(neg_flow)
+    total = pos_sum + neg_sum
+    mfi = np.full_like(pos_sum, 0.5)
+    np.divide(pos_sum, total, out=mfi, where=total > 0)
+    mfi[:window] = 0.5
+    return {"": _fill_zero(mfi)}
+
+
+class IndicatorSpec(NamedTuple):
+    """An indicator family of the engine.
+
+    name is the stockstats handler name (e.g. "macd"), outputs the suffixes
+    of the series it produces ("" for the base name, "s" for macds, ...),
+    default_windows its parameters when the name carries none, and
+    column_based whether it applies to a price column (close_50_sma).
+    """
+
+    name: str
+    compute: Callable[[Dict[str, np.ndarray], Optional[str], Tuple[int, ...]], Dict[str, np.ndarray]]
+    default_windows: Tuple[int, ...]
+    outputs: Tuple[str, ...] = ("",)
+    inputs: Tuple[str, ...] = ("close",)
+    column_based: bool = False
+
+
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(spec: IndicatorSpec):
+    """Add an indicator family to the engine."""
+    INDICATOR_REGISTRY[spec.name] = spec
+
+
+for _spec in (
+    IndicatorSpec("sma", _compute_sma, (5,), column_based=True),
+    IndicatorSpec("ema", _compute_ema, (5,), column_based=True),
+    IndicatorSpec("rsi", _compute_rsi, (14,)),
+    IndicatorSpec("macd", _compute_macd, (12, 26, 9), outputs=("", "s", "h")),
+    IndicatorSpec("boll", _compute_boll, (20,), outputs=("", "_ub", "_lb")),
+    IndicatorSpec("atr", _compute_atr, (14,), inputs=("high", "low", "close")),
+    IndicatorSpec("vwma", _compute_vwma, (14,), inputs=("high", "low", "close", "volume")),
+    IndicatorSpec("mfi", _compute_mfi, (14,), inputs=("high", "low", "close", "volume")),
+):
+    register_indicator(_spec)
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume", "amount")
+
+
+class _Request(NamedTuple):
+    spec: IndicatorSpec
+    column: Optional[str]
+    windows: Tuple[int, ...]
+    output: str
+
+
+def _parse(name: str) -> Optional[_Request]:
+    # names without parameters, e.g. rsi, macds, boll_ub
+    for spec in INDICATOR_REGISTRY.values():
+        if spec.column_based:
+            continue
+        for output in spec.outputs:
+            if name == spec.name + output:
+                return _Request(spec, None, spec.default_windows, output)
+
+    # {column}_{window}_{name}, e.g. close_50_sma
+    match = re.fullmatch(r"([a-z]+)_(\d+)_([a-z]+)", name)
+    if match:
+        column, window, spec_name = match.groups()
+        spec = INDICATOR_REGISTRY.get(spec_name)
+        if spec is not None and spec.column_based and column in PRICE_COLUMNS:
+            return _Request(spec, column, (int(window),), "")
+        return None
+
+    # {name}_{window}, e.g. rsi_6, atr_20
+    match = re.fullmatch(r"([a-z]+)_(\d+)", name)
+    if match:
+        spec_name, window = match.groups()
+        spec = INDICATOR_REGISTRY.get(spec_name)
+        if (
+            spec is not None
+            and not spec.column_based
+            and len(spec.default_windows) == 1
+            and spec.outputs == ("",)
+            and int(window) > 0
+        ):
+            return _Request(spec, None, (int(window),), "")
+    return None
+
+
+def is_supported(name: str) -> bool:
+    """Whether the engine computes the indicator (otherwise fall back to stockstats)."""
+    return _parse(name) is not None
+
+
+def required_inputs(names: Iterable[str]) -> List[str]:
+    """Price columns the given indicators read."""
+    inputs = []
+    for name in names:
+        request = _parse(name)
+        if request is None:
+            continue
+        for column in request.spec.inputs if request.column is None else (request.column,):
+            if column not in inputs:
+                inputs.append(column)
+    return inputs
+
+
+def compute_indicators(
+    prices: Dict[str, np.ndarray], names: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    """Compute the named indicators over the price arrays in one call.
+
+    prices maps lower-case column names (open, high, low, close, volume and
+    optionally amount) to equally long arrays. Indicators sharing a
+    computation (macd/macds/macdh, boll/boll_ub/boll_lb) are computed once.
+
+    Raises:
+        KeyError: for an indicator the engine does not support.
+    """
+    prices = {column: as_float_array(values) for column, values in prices.items()}
+
+    results = {}
+    computed = {}
+    for name in names:
+        request = _parse(name)
+        if request is None:
+            raise KeyError(f"Unsupported indicator: {name}")
+        key = (request.spec.name, request.column, request.windows)
+        if key not in computed:
+            computed[key] = request.spec.compute(prices, request.column, request.windows)
+        results[name] = computed[key][request.output]
+    return results
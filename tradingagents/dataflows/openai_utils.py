@@ -0,0 +1,98 @@
+import os
+import threading
+from typing import Dict, Optional
+
+from openai import OpenAI
+
+from .cache_utils import DiskCache, SingleFlight
+from .config import get_config
+
+_clients: Dict[str, OpenAI] = {}
+_result_cache = None
+_flights = SingleFlight()
+_state_lock = threading.Lock()
+
+
+def get_openai_client(base_url: str) -> OpenAI:
+    """OpenAI client shared by all calls to base_url, keeping its connections alive."""
+    with _state_lock:
+        if base_url not in _clients:
+            _clients[base_url] = OpenAI(base_url=base_url)
+        return _clients[base_url]
+
+
+def get_result_cache() -> DiskCache:
+    """On-disk cache of web search answers in the configured data cache dir."""
+    global _result_cache
+    config = get_config()
+    directory = os.path.join(config["data_cache_dir"], "openai_tools")
+    with _state_lock:
+        if _result_cache is None or _result_cache.directory != directory:
+            _result_cache = DiskCache(
+                directory,
+                ttl=config.get("openai_tool_cache_ttl"),
+                max_bytes=config.get("openai_tool_cache_max_bytes"),
+            )
+        return _result_cache
+
+
+def web_search(prompt: str) -> str:
+    """Answer of the quick thinking model to prompt, using web search."""
+    config = get_config()
+    client = get_openai_client(config["backend_url"])
+
+    response = client.responses.create(
+        model=config["quick_think_llm"],
+        input=[
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": prompt,
+                    }
+                ],
+            }
+        ],
+        text={"format": {"type": "text"}},
+        reasoning={},
+        tools=[
+            {
+                "type": "web_search_preview",
+                "user_location": {"type": "approximate"},
+                "search_context_size": "low",
+            }
+        ],
+        temperature=1,
+        max_output_tokens=4096,
+        top_p=1,
+        store=True,
+    )
+
+    return response.output[1].content[0].text
+
+
+def cached_web_search(
+    tool: str, ticker: Optional[str], curr_date: str, prompt: str
+) -> str:
+    """web_search answer memoized by (tool, ticker, date, model).
+
+    Answers are kept on disk for openai_tool_cache_ttl seconds, and
+    concurrent calls for the same key share one request.
+    """
+    cache = get_result_cache()
+    key = ("openai", tool, ticker, curr_date, get_config()["quick_think_llm"])
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        # another caller may have finished the same request meanwhile
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        result = web_search(prompt)
+        cache.put(key, result)
+        return result
+
+    return _flights.do(key, fetch)
@@ -0,0 +1,150 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Annotated, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import requests
+import yfinance as yf
+
+from .bar_store import BarStore, get_bar_store
+
+
+class YFinanceBarDownloader:
+    """Downloads the daily bars of many symbols in one Yahoo Finance request."""
+
+    def download(
+        self, symbols: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        data = yf.download(
+            symbols,
+            start=start_date,
+            end=end_date,
+            group_by="ticker",
+            multi_level_index=True,
+            progress=False,
+            auto_adjust=True,
+            actions=True,
+        )
+        bars = {}
+        if data is None or data.empty:
+            return bars
+        for symbol in symbols:
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            symbol_bars = data[symbol].dropna(how="all")
+            if not symbol_bars.empty:
+                bars[symbol] = symbol_bars
+        return bars
+
+
+class HTTPBarDownloader:
+    """Downloads daily bars from an HTTP endpoint, e.g. a local stand-in for tests.
+
+    The endpoint is requested as GET {base_url}/bars?symbols=A,B&start=...&end=...
+    and answers a json object mapping each symbol to a list of bars, each bar
+    a json object with a Date (yyyy-mm-dd) and the OHLCV fields.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def download(
+        self, symbols: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        response = self.session.get(
+            f"{self.base_url}/bars",
+            params={"symbols": ",".join(symbols), "start": start_date, "end": end_date},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return {
+            symbol: pd.DataFrame(records)
+            for symbol, records in response.json().items()
+            if records
+        }
+
+
+def _plan_symbols(plan) -> List[str]:
+    symbols = []
+    for entry in plan:
+        symbol = entry if isinstance(entry, str) else entry[0]
+        if symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+def prefetch_bars(
+    plan: Annotated[
+        Iterable[Union[str, tuple]],
+        "tickers, or (ticker, trade date) pairs, of the runs to prepare",
+    ],
+    end_date: Annotated[
+        Optional[str], "day after the last bar needed, yyyy-mm-dd, defaults to today"
+    ] = None,
+    max_concurrency: Annotated[int, "maximum number of requests in flight"] = 4,
+    batch_size: Annotated[int, "maximum number of symbols per request"] = 50,
+    downloader=None,
+    store: Optional[BarStore] = None,
+) -> Dict[str, str]:
+    """Bring the bar store up to date for every ticker of a run plan.
+
+    Symbols missing the same range of bars are downloaded together in
+    multi-symbol requests of up to batch_size symbols, with at most
+    max_concurrency requests in flight, and merged into the bar store. Later
+    online price and indicator lookups for these symbols are then local reads.
+
+    Returns:
+        dict: symbol -> path of its bars for every symbol covered up to end_date
+    """
+    store = store or get_bar_store()
+    downloader = downloader or YFinanceBarDownloader()
+    if end_date is None:
+        end_date = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    symbols = _plan_symbols(plan)
+
+    # symbols missing the same range are fetched together
+    groups: Dict[str, List[str]] = {}
+    for symbol in symbols:
+        start_date = store.missing_start(symbol, end_date)
+        if start_date is not None:
+            groups.setdefault(start_date, []).append(symbol)
+
+    batches = [
+        (start_date, group[i : i + batch_size])
+        for start_date, group in groups.items()
+        for i in range(0, len(group), batch_size)
+    ]
+
+    def download_one(symbol, start, end):
+        return downloader.download([symbol], start, end).get(symbol)
+
+    print_lock = threading.Lock()
+
+    def fetch(start_date, batch):
+        bars = downloader.download(batch, start_date, end_date)
+        for symbol in batch:
+            with store.lock(symbol):
+                if store.missing_start(symbol, end_date) is None:
+                    continue  # updated meanwhile by another process
+                store.merge(symbol, bars.get(symbol), end_date, download_one)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = {
+            executor.submit(fetch, start_date, batch): batch
+            for start_date, batch in batches
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                with print_lock:
+                    print(f"Prefetch of {', '.join(futures[future])} failed: {e}")
+
+    return {
+        symbol: store.bars_path(symbol)
+        for symbol in symbols
+        if store.missing_start(symbol, end_date) is None
+    }
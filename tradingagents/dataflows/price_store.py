@@ -0,0 +1,219 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Annotated, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+PRICE_FILE_TEMPLATE = "{symbol}-YFin-data-2015-01-01-2025-03-25.csv"
+
+DATE_COLUMN = "Date"
+_META_FILE = "meta.json"
+_DAY_INDEX_FILE = "day_index.npy"
+
+
+def get_price_file(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    data_dir: Annotated[str, "directory where the YFin csv files are stored"],
+) -> str:
+    """Path of the offline Yahoo Finance csv for a symbol."""
+    return os.path.join(data_dir, PRICE_FILE_TEMPLATE.format(symbol=symbol))
+
+
+def to_epoch_day(date_str: Annotated[str, "date in yyyy-mm-dd format"]) -> int:
+    """Days since 1970-01-01 for the date part of a yyyy-mm-dd[...] string."""
+    return int(np.datetime64(date_str[:10], "D").astype(np.int64))
+
+
+class PriceTable:
+    """Read-only, memory-mapped view of one converted price file.
+
+    Rows are sorted by an int64 epoch-day index, so date ranges resolve to a
+    contiguous slice through binary search and every column slice is a view
+    over the mapped file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, _META_FILE), "r") as f:
+            self.meta = json.load(f)
+        self.columns = [col["name"] for col in self.meta["columns"]]
+        self.day_index = np.load(os.path.join(path, _DAY_INDEX_FILE), mmap_mode="r")
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.day_index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped array for a column."""
+        array = self._arrays.get(name)
+        if array is None:
+            position = self.columns.index(name)
+            array = np.load(
+                os.path.join(self.path, self.meta["columns"][position]["file"]),
+                mmap_mode="r",
+            )
+            self._arrays[name] = array
+        return array
+
+    def locate(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> slice:
+        """Row slice covering start_date..end_date (both inclusive)."""
+        lo = 0
+        hi = len(self.day_index)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.day_index, to_epoch_day(start_date), "left"))
+        if end_date is not None:
+            hi = int(np.searchsorted(self.day_index, to_epoch_day(end_date), "right"))
+        return slice(lo, max(lo, hi))
+
+    def has_date(self, date: Annotated[str, "date in yyyy-mm-dd format"]) -> bool:
+        """Whether the table holds a row (i.e. a trading day) on date."""
+        rows = self.locate(date, date)
+        return rows.stop > rows.start
+
+    def to_frame(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        copy: bool = False,
+    ) -> pd.DataFrame:
+        """DataFrame of the rows between start_date and end_date.
+
+        The index keeps the row positions of the source csv. Numeric columns
+        are views over the mapped files unless copy is set, which callers that
+        mutate the frame (e.g. stockstats) need.
+        """
+        rows = self.locate(start_date, end_date)
+        data = {}
+        for name in self.columns:
+            values = self.column(name)[rows]
+            if values.dtype.kind == "U":
+                values = values.astype(object)
+            elif copy:
+                values = np.array(values)
+            data[name] = values
+        return pd.DataFrame(
+            data, index=pd.RangeIndex(rows.start, rows.stop), copy=False
+        )
+
+
+class PriceStore:
+    """Converts Yahoo Finance csv files once into columnar .npy files.
+
+    Every source file gets its own directory under store_dir, named after the
+    file and its (mtime, size) so an updated csv is picked up automatically.
+    Converted tables are memory-mapped and shared within the process.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self._tables: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_table(self, csv_path: str) -> PriceTable:
+        """Return the table for csv_path, converting the csv if needed."""
+        stat = os.stat(csv_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._tables.get(csv_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._tables.get(csv_path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            stem = os.path.splitext(os.path.basename(csv_path))[0]
+            target = os.path.join(self.store_dir, f"{stem}-{version[0]}-{version[1]}")
+            if not os.path.exists(os.path.join(target, _META_FILE)):
+                self._convert(csv_path, target, version)
+                self._remove_stale_versions(stem, target)
+
+            table = PriceTable(target)
+            self._tables[csv_path] = (version, table)
+            return table
+
+    def _convert(self, csv_path: str, target: str, version: tuple):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_dir = f"{target}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(tmp_dir)
+
+        try:
+            data = pd.read_csv(csv_path)
+            day_index = (
+                pd.to_datetime(data[DATE_COLUMN].astype(str).str[:10])
+                .values.astype("datetime64[D]")
+                .astype(np.int64)
+            )
+            order = np.argsort(day_index, kind="stable")
+            np.save(os.path.join(tmp_dir, _DAY_INDEX_FILE), day_index[order])
+
+            columns = []
+            for position, name in enumerate(data.columns):
+                values = data[name].to_numpy()[order]
+                if values.dtype == object:
+                    values = values.astype(str)
+                file_name = f"col{position}.npy"
+                np.save(os.path.join(tmp_dir, file_name), values)
+                columns.append({"name": name, "file": file_name})
+
+            with open(os.path.join(tmp_dir, _META_FILE), "w") as f:
+                json.dump(
+                    {
+                        "source": os.path.abspath(csv_path),
+                        "mtime_ns": version[0],
+                        "size": version[1],
+                        "rows": int(len(data)),
+                        "columns": columns,
+                    },
+                    f,
+                )
+
+            try:
+                os.rename(tmp_dir, target)
+            except OSError:
+                # another process finished the same conversion first
+                if not os.path.exists(os.path.join(target, _META_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _remove_stale_versions(self, stem: str, current: str):
+        for entry in os.listdir(self.store_dir):
+            path = os.path.join(self.store_dir, entry)
+            if (
+                path != current
+                and entry.startswith(f"{stem}-")
+                and ".tmp-" not in entry
+                and entry[len(stem) + 1 :].replace("-", "").isdigit()
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Process-wide price store rooted in the configured data cache dir."""
+    store_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+    with _stores_lock:
+        if store_dir not in _stores:
+            _stores[store_dir] = PriceStore(store_dir)
+        return _stores[store_dir]
+
+
+def load_price_table(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    data_dir: Annotated[str, "directory where the YFin csv files are stored"],
+) -> PriceTable:
+    """Memory-mapped price table for the offline YFin csv of a symbol."""
+    return get_price_store().get_table(get_price_file(symbol, data_dir))
@@ -0,0 +1,250 @@
+import json
+import os
+import pickle
+import re
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+
+from .cache_utils import LRUCache
+from .config import get_config
+
+# (byte offset, byte length, upvotes) of one post in its .jsonl file
+PostRef = Tuple[int, int, int]
+
+
+def post_day(created_utc: float) -> str:
+    """UTC day of a post as yyyy-mm-dd."""
+    return datetime.utcfromtimestamp(created_utc).strftime("%Y-%m-%d")
+
+
+# characters giving a search term regex meaning beyond its literal text
+_REGEX_SPECIAL = frozenset(".^$*+?{}[]\\|()")
+# the only non-ASCII characters re.IGNORECASE matches to ASCII ones; with these
+# translated, lowercasing a text folds it exactly as re.IGNORECASE does for
+# ASCII search terms
+_ASCII_FOLDS = {0x130: "i", 0x131: "i", 0x17F: "s", 0x212A: "k"}
+
+
+class MentionMatcher:
+    """Finds which of many tickers a text mentions in one regex scan.
+
+    The literal search terms of all tickers are merged into one trie shaped
+    lookahead pattern with an empty named group where each term ends, so the
+    match at a position ends in the group of the longest term starting there;
+    the terms it extends are known in advance. Terms using regex syntax keep
+    a pattern of their own. The result equals searching the text with every
+    ticker's case-insensitive company matcher separately.
+    """
+
+    def __init__(self, terms: Dict[str, List[str]]):
+        term_tickers: Dict[str, Set[str]] = {}
+        self._patterns: List[Tuple[Pattern, str]] = []
+        for ticker, ticker_terms in terms.items():
+            for term in ticker_terms:
+                if term.isascii() and not _REGEX_SPECIAL.intersection(term):
+                    term_tickers.setdefault(term.lower(), set()).add(ticker)
+                else:
+                    self._patterns.append((re.compile(term, re.IGNORECASE), ticker))
+
+        # group name -> tickers of its term and of the terms it extends
+        self._groups: Dict[str, Set[str]] = {}
+        trie: dict = {}
+        for i, term in enumerate(sorted(term_tickers)):
+            node, tickers = trie, set()
+            for char in term:
+                node = node.setdefault(char, {})
+                if "" in node:
+                    tickers |= self._groups[node[""]]
+            node[""] = f"t{i}"
+            self._groups[node[""]] = tickers | term_tickers[term]
+
+        # scanning lowercased text case-sensitively is several times faster
+        # than a re.IGNORECASE scan
+        self._trie = None
+        if term_tickers:
+            self._trie = re.compile("(?=" + self._trie_pattern(trie) + ")")
+
+    @classmethod
+    def _trie_pattern(cls, node: dict) -> str:
+        branches = [
+            re.escape(char) + cls._trie_pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        pattern = ""
+        if branches:
+            pattern = "|".join(branches)
+            if len(branches) > 1 or "" in node:
+                pattern = f"(?:{pattern})"
+        if "" in node:
+            pattern = f"(?P<{node['']}>)" + (f"{pattern}?" if branches else "")
+        return pattern
+
+    def mentioned(self, text: str) -> Set[str]:
+        found = {ticker for pattern, ticker in self._patterns if pattern.search(text)}
+        if self._trie is not None:
+            if not text.isascii():
+                text = text.translate(_ASCII_FOLDS)
+            for match in self._trie.finditer(text.lower()):
+                found |= self._groups[match.lastgroup]
+        return found
+
+
+class SubredditIndex:
+    """Day-partitioned index over the posts of one subreddit .jsonl file.
+
+    For every UTC day the index lists the byte offset, length and upvotes of
+    the posts created that day, sorted by upvotes (descending, file order on
+    ties). Posts are read back with a seek, so a date window only touches the
+    lines of the days it covers.
+
+    When built with company search terms, the index also holds an inverted
+    index from ticker to the (day-partitioned, sorted) posts mentioning it.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        days: Dict[str, List[PostRef]],
+        mentions: Optional[Dict[str, Dict[str, List[PostRef]]]] = None,
+    ):
+        self.source = source
+        self.days = days
+        self.mentions = mentions or {}
+
+    @classmethod
+    def build(
+        cls, source: str, terms: Optional[Dict[str, List[str]]] = None
+    ) -> "SubredditIndex":
+        days: Dict[str, List[PostRef]] = {}
+        mentions: Dict[str, Dict[str, List[PostRef]]] = {
+            ticker: {} for ticker in (terms or {})
+        }
+        mention_matcher = MentionMatcher(terms) if terms else None
+        with open(source, "rb") as f:
+            offset = 0
+            for line in f:
+                length = len(line)
+                # skip empty lines
+                if line.strip():
+                    parsed_line = json.loads(line)
+                    day = post_day(parsed_line["created_utc"])
+                    ref = (offset, length, parsed_line["ups"])
+                    days.setdefault(day, []).append(ref)
+
+                    if mention_matcher is not None:
+                        tickers = mention_matcher.mentioned(
+                            parsed_line["title"]
+                        ) | mention_matcher.mentioned(parsed_line["selftext"])
+                        for ticker in tickers:
+                            mentions[ticker].setdefault(day, []).append(ref)
+                offset += length
+
+        for refs in days.values():
+            refs.sort(key=lambda ref: ref[2], reverse=True)
+        for ticker_days in mentions.values():
+            for refs in ticker_days.values():
+                refs.sort(key=lambda ref: ref[2], reverse=True)
+        return cls(source, days, mentions)
+
+    def refs(self, day: str) -> List[PostRef]:
+        return self.days.get(day, [])
+
+    def has_mentions(self, ticker: str) -> bool:
+        return ticker in self.mentions
+
+    def mention_refs(self, ticker: str, day: str) -> List[PostRef]:
+        """Posts of day mentioning ticker, sorted by upvotes."""
+        return self.mentions[ticker].get(day, [])
+
+    def read(self, f, ref: PostRef) -> dict:
+        """Parse the post at ref from the already opened source file f."""
+        f.seek(ref[0])
+        return json.loads(f.read(ref[1]))
+
+
+class RedditIndexStore:
+    """Builds, persists and caches the SubredditIndex of each .jsonl file.
+
+    Indexes are pickled under index_dir next to a copy of the source file's
+    mtime and size and the version of the company search terms, and rebuilt
+    when either changes.
+    """
+
+    def __init__(self, index_dir: str, max_indexes: int = 256):
+        self.index_dir = index_dir
+        self.cache = LRUCache(max_entries=max_indexes)
+        self._lock = threading.Lock()
+
+    def _index_path(self, source: str) -> str:
+        category = os.path.basename(os.path.dirname(source))
+        return os.path.join(
+            self.index_dir, category, os.path.basename(source) + ".idx"
+        )
+
+    def get(
+        self,
+        source: str,
+        terms: Optional[Dict[str, List[str]]] = None,
+        terms_version: str = "",
+    ) -> SubredditIndex:
+        """Index of source, with mentions of the tickers of terms if given."""
+        stat = os.stat(source)
+        version = (stat.st_mtime_ns, stat.st_size, terms_version)
+        key = (os.path.abspath(source), version)
+
+        index = self.cache.get(key)
+        if index is not None:
+            return index
+
+        with self._lock:
+            index = self.cache.get(key)
+            if index is not None:
+                return index
+
+            index_path = self._index_path(source)
+            index = self._load(index_path, version)
+            if index is None:
+                index = SubredditIndex.build(source, terms)
+                self._save(index_path, version, index)
+            index.source = source
+            self.cache.put(key, index)
+            return index
+
+    def _load(self, index_path: str, version: tuple):
+        if not os.path.exists(index_path):
+            return None
+        try:
+            with open(index_path, "rb") as f:
+                stored_version, days, mentions = pickle.load(f)
+        except Exception:
+            return None
+        if tuple(stored_version) != version:
+            return None
+        return SubredditIndex(index_path, days, mentions)
+
+    def _save(self, index_path: str, version: tuple, index: SubredditIndex):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (version, index.days, index.mentions),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, index_path)
+
+
+_stores: Dict[str, RedditIndexStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_reddit_index_store() -> RedditIndexStore:
+    """Process-wide index store rooted in the configured data cache dir."""
+    index_dir = os.path.join(get_config()["data_cache_dir"], "reddit_index")
+    with _stores_lock:
+        if index_dir not in _stores:
+            _stores[index_dir] = RedditIndexStore(index_dir)
+        return _stores[index_dir]
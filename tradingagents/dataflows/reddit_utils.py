@@ -3,10 +3,14 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Pattern
+import hashlib
 import os
 import re
 
+from .reddit_index import get_reddit_index_store
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,87 +53,153 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+def company_terms(
+    query: Annotated[str, "ticker symbol of the company"],
+) -> list:
+    """Search terms of a company: its aliases in ticker_to_company plus the ticker."""
+    search_terms = []
+    if query in ticker_to_company:
+        search_terms = ticker_to_company[query].split(" OR ")
+    search_terms.append(query)
+    return search_terms
+
+
+@lru_cache(maxsize=None)
+def company_matcher(
+    query: Annotated[str, "ticker symbol of the company"],
+) -> Pattern:
+    """Single compiled, case-insensitive alternation over all terms of a company."""
+    return re.compile(
+        "|".join(f"(?:{term})" for term in company_terms(query)), re.IGNORECASE
+    )
+
+
+def company_matchers_version() -> str:
+    """Fingerprint of ticker_to_company, so indexes are rebuilt when aliases change."""
+    return hashlib.sha1(
+        json.dumps(sorted(ticker_to_company.items())).encode()
+    ).hexdigest()
+
+
+def mentions_company(
+    parsed_line: Annotated[dict, "parsed reddit post"],
+    query: Annotated[str, "ticker symbol of the company"],
+) -> bool:
+    """Whether the title or the content of a post mentions the company."""
+    matcher = company_matcher(query)
+    return bool(
+        matcher.search(parsed_line["title"]) or matcher.search(parsed_line["selftext"])
+    )
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date (inclusive) to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
+    """
+    Fetch the top posts of every day in a date window in one pass per subreddit.
+    Posts are looked up through the day-partitioned index of each subreddit file,
+    and the result is ordered as if fetch_top_from_category had been called for
+    each day from start_date to end_date.
+    """
     base_path = data_path
+    category_files = os.listdir(os.path.join(base_path, category))
 
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(category_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(category_files)
+
+    days = []
+    curr_date = datetime.strptime(start_date, "%Y-%m-%d")
+    while curr_date <= datetime.strptime(end_date, "%Y-%m-%d"):
+        days.append(curr_date.strftime("%Y-%m-%d"))
+        curr_date += timedelta(days=1)
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
+    index_store = get_reddit_index_store()
+    # day -> top posts of each subreddit, in file listing order
+    content_by_day = {day: [] for day in days}
+
+    for data_file in category_files:
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
+        source = os.path.join(base_path, category, data_file)
+        if "company" in category:
+            # company categories also index which tickers each post mentions
+            index = index_store.get(
+                source,
+                {ticker: company_terms(ticker) for ticker in ticker_to_company},
+                company_matchers_version(),
+            )
+        else:
+            index = index_store.get(source)
+        use_mentions = "company" in category and query and index.has_mentions(query)
+
+        with open(source, "rb") as f:
+            for day in days:
+                all_content_curr_subreddit = []
+
+                if use_mentions:
+                    # posts of the day already known to mention the company
+                    refs = index.mention_refs(query, day)
+                else:
+                    refs = index.refs(day)
+
+                # refs are sorted by upvotes, so stop once the day's quota is filled
+                for ref in refs:
+                    if len(all_content_curr_subreddit) >= limit_per_subreddit:
+                        break
+
+                    parsed_line = index.read(f, ref)
+
+                    # if is company_news, check that the title or the content has the company's name (query) mentioned
+                    if "company" in category and query and not use_mentions:
+                        if not mentions_company(parsed_line, query):
+                            continue
+
+                    all_content_curr_subreddit.append(
+                        {
+                            "title": parsed_line["title"],
+                            "content": parsed_line["selftext"],
+                            "url": parsed_line["url"],
+                            "upvotes": parsed_line["ups"],
+                            "posted_date": day,
+                        }
+                    )
+
+                content_by_day[day].extend(all_content_curr_subreddit)
 
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    all_content = []
+    for day in days:
+        all_content.extend(content_by_day[day])
+    return all_content
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
-    return all_content
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query=query, data_path=data_path
+    )
@@ -1,12 +1,166 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Dict, List, Tuple
 import os
-from .config import get_config
+from .bar_store import get_bar_store
+from .indicators import PRICE_COLUMNS, as_float_array, compute_indicators, is_supported
+from .indicator_cache import DAYS_KEY, get_indicator_cache, get_source_version
+from .price_store import get_price_file, get_price_store
+
+NOT_A_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
 
 
 class StockstatsUtils:
+    @staticmethod
+    def get_data_file(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> str:
+        """Path of the price file backing a symbol, downloading it when online."""
+        if not online:
+            data_file = get_price_file(symbol, data_dir)
+            if not os.path.exists(data_file):
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            return data_file
+
+        # bring the symbol's stored bars up to today, downloading only the missing tail
+        data_file = get_bar_store().update(symbol)
+        if not os.path.exists(data_file):
+            raise Exception(f"Stockstats fail: no Yahoo Finance data for {symbol}!")
+
+        return data_file
+
+    @staticmethod
+    def load_stock_data(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        """Load the price history of a symbol wrapped as a stockstats frame."""
+        data_file = StockstatsUtils.get_data_file(symbol, data_dir, online)
+
+        if not online:
+            data = get_price_store().get_table(data_file).to_frame(copy=True)
+            df = wrap(data)
+        else:
+            data = pd.read_csv(data_file)
+            data["Date"] = pd.to_datetime(data["Date"])
+            df = wrap(data)
+            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+
+        return df
+
+    @staticmethod
+    def load_price_arrays(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Price history of a symbol as arrays for the indicator engine.
+
+        Returns:
+            tuple: (yyyy-mm-dd label of every row, lower-case column -> float64 array)
+        """
+        data_file = StockstatsUtils.get_data_file(symbol, data_dir, online)
+
+        if not online:
+            table = get_price_store().get_table(data_file)
+            days = np.asarray(table.column("Date")).astype("U10")
+            columns = {name.lower(): name for name in table.columns}
+            prices = {
+                column: as_float_array(table.column(columns[column]))
+                for column in PRICE_COLUMNS
+                if column in columns
+            }
+        else:
+            data = pd.read_csv(data_file)
+            days = pd.to_datetime(data["Date"]).dt.strftime("%Y-%m-%d").to_numpy().astype(str)
+            columns = {name.lower(): name for name in data.columns}
+            prices = {
+                column: as_float_array(data[columns[column]].to_numpy())
+                for column in PRICE_COLUMNS
+                if column in columns
+            }
+
+        return days, prices
+
+    @staticmethod
+    def get_indicator_series(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            List[str],
+            "quantitative indicators based off of the stock data for the company",
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Full-history indicator series of a symbol, served from the indicator cache.
+
+        Only the indicators missing from the cache for the current version of
+        the price file are computed, all in one call to the indicator engine;
+        indicators the engine does not support are computed on a single
+        stockstats frame.
+
+        Returns:
+            tuple: (yyyy-mm-dd label of every row, indicator -> series aligned with the labels)
+        """
+        data_file = StockstatsUtils.get_data_file(symbol, data_dir, online)
+        version = get_source_version(data_file)
+        cache = get_indicator_cache()
+
+        days = cache.get(symbol, DAYS_KEY, version)
+        series = cache.get_many(symbol, indicators, version)
+        missing = [indicator for indicator in indicators if indicator not in series]
+
+        if days is None or missing:
+            engine_missing = [name for name in missing if is_supported(name)]
+            other_missing = [name for name in missing if not is_supported(name)]
+
+            if days is None or engine_missing:
+                days, prices = StockstatsUtils.load_price_arrays(
+                    symbol, data_dir, online
+                )
+                cache.put(symbol, DAYS_KEY, version, days)
+                for indicator, values in compute_indicators(
+                    prices, engine_missing
+                ).items():
+                    series[indicator] = values
+                    cache.put(symbol, indicator, version, values)
+
+            if other_missing:
+                df = StockstatsUtils.load_stock_data(symbol, data_dir, online)
+                for indicator in other_missing:
+                    series[indicator] = df[indicator].to_numpy()
+                    cache.put(symbol, indicator, version, series[indicator])
+
+        return days, series
+
     @staticmethod
     def get_stock_stats(
         symbol: Annotated[str, "ticker symbol for the company"],
@@ -25,63 +179,60 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
+        days, series = StockstatsUtils.get_indicator_series(
+            symbol, [indicator], data_dir, online
+        )
+        if online:
+            curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        matching_rows = np.flatnonzero(days == curr_date[:10])
+
+        if len(matching_rows) > 0:
+            indicator_value = series[indicator][matching_rows[0]]
+            return indicator_value
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+            return NOT_A_TRADING_DAY
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            List[str],
+            "quantitative indicators based off of the stock data for the company",
+        ],
+        start_date: Annotated[str, "start of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "end of the window (inclusive), YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, Dict[str, object]]:
+        """Indicator values for every trading day between start_date and end_date.
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        Each indicator series is computed (or read from the indicator cache)
+        once over the whole history before the window is sliced out of it.
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        Returns:
+            dict: indicator -> {yyyy-mm-dd: value} for the trading days in the window
+        """
+        days, series = StockstatsUtils.get_indicator_series(
+            symbol, indicators, data_dir, online
+        )
+
+        in_window = (days >= start_date) & (days <= end_date)
+        window_days = days[in_window].tolist()
+
+        result = {}
+        for indicator in indicators:
+            values = series[indicator][in_window]
+            day_values = {}
+            for day, value in zip(window_days, values):
+                # keep the first row of a day, as get_stock_stats does
+                day_values.setdefault(day, value)
+            result[indicator] = day_values
+
+        return result
@@ -0,0 +1,422 @@
+"""
+Incremental technical indicators for live price feeds.
+
+Every indicator keeps a constant amount of state (a ring buffer for windowed
+ones) and is updated in O(1) per tick, with the same semantics as the batch
+engine in indicators.py: feeding a series tick by tick yields the values the
+engine computes over the whole series. A StreamingIndicatorHub keeps one set
+of indicators per token, fed by a pluggable price source, so tools can read
+the current values without downloading and recomputing the history.
+"""
+
+import csv
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .indicators import BOLL_STD_TIMES
+
+# (token id, unix timestamp in seconds, price)
+Tick = Tuple[str, float, float]
+
+# windowed sums are recomputed from the buffer this often to cancel drift
+_RESYNC_EVERY = 1024
+
+
+class RingBuffer:
+    """Fixed-size FIFO over a preallocated float64 array."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = np.zeros(size, dtype=np.float64)
+        self.count = 0
+        self._next = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, value: float) -> Optional[float]:
+        """Store value, returning the value it evicted once the buffer is full."""
+        evicted = self.values[self._next] if self.count >= self.size else None
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+        return evicted
+
+    def window(self) -> np.ndarray:
+        """Stored values, oldest first."""
+        if self.count < self.size:
+            return self.values[: self.count]
+        return np.concatenate([self.values[self._next :], self.values[: self._next]])
+
+
+class StreamingSMA:
+    """Simple moving average with min_periods=1."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.total = 0.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        evicted = self.buffer.append(x)
+        self.total += x - (evicted if evicted is not None else 0.0)
+        if self.buffer.count % _RESYNC_EVERY == 0:
+            self.total = float(self.buffer.window().sum())
+        self.value = self.total / len(self.buffer)
+        return self.value
+
+
+class StreamingStd:
+    """Sample (ddof=1) moving standard deviation with min_periods=1.
+
+    Sums are taken around the first value seen to limit cancellation.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.anchor = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        if self.anchor is None:
+            self.anchor = x
+        evicted = self.buffer.append(x)
+        d = x - self.anchor
+        self.total += d
+        self.total_sq += d * d
+        if evicted is not None:
+            e = evicted - self.anchor
+            self.total -= e
+            self.total_sq -= e * e
+        if self.buffer.count % _RESYNC_EVERY == 0:
+            deviations = self.buffer.window() - self.anchor
+            self.total = float(deviations.sum())
+            self.total_sq = float((deviations * deviations).sum())
+
+        n = len(self.buffer)
+        if n < 2:
+            self.value = math.nan
+        else:
+            variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+            self.value = math.sqrt(max(variance, 0.0))
+        return self.value
+
+
+class StreamingEWM:
+    """Adjusted exponentially weighted mean, the recurrence form of ewm_mean."""
+
+    def __init__(self, alpha: float):
+        self.decay = 1.0 - alpha
+        self.num = 0.0
+        self.den = 0.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        self.num = x + self.decay * self.num
+        self.den = 1.0 + self.decay * self.den
+        self.value = self.num / self.den
+        return self.value
+
+
+class StreamingEMA(StreamingEWM):
+    """Exponential moving average over span periods."""
+
+    def __init__(self, span: int):
+        super().__init__(2.0 / (span + 1.0))
+
+
+class StreamingSMMA(StreamingEWM):
+    """Smoothed (Wilder) moving average."""
+
+    def __init__(self, window: int):
+        super().__init__(1.0 / window)
+
+
+class StreamingRSI:
+    """Relative strength index with Wilder smoothing."""
+
+    def __init__(self, window: int = 14):
+        self.up = StreamingSMMA(window)
+        self.down = StreamingSMMA(window)
+        self.prev = None
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        diff = 0.0 if self.prev is None else x - self.prev
+        up = self.up.update(diff if diff > 0 else 0.0)
+        down = self.down.update(-diff if diff < 0 else 0.0)
+        if self.prev is None:
+            self.value = 50.0
+        else:
+            total = up + down
+            self.value = 100 * (up / total) if total != 0 else 50.0
+        self.prev = x
+        return self.value
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, short_window: int = 12, long_window: int = 26, signal_window: int = 9):
+        self.short = StreamingEMA(short_window)
+        self.long = StreamingEMA(long_window)
+        self.signal_ema = StreamingEMA(signal_window)
+        self.macd = self.signal = self.histogram = math.nan
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        return self.macd, self.signal, self.histogram
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        self.macd = self.short.update(x) - self.long.update(x)
+        self.signal = self.signal_ema.update(self.macd)
+        self.histogram = self.macd - self.signal
+        return self.value
+
+
+class StreamingBollinger:
+    """Bollinger middle, upper and lower bands."""
+
+    def __init__(self, window: int = 20):
+        self.sma = StreamingSMA(window)
+        self.std = StreamingStd(window)
+        self.middle = self.upper = self.lower = math.nan
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        return self.middle, self.upper, self.lower
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        self.middle = self.sma.update(x)
+        width = BOLL_STD_TIMES * self.std.update(x)
+        self.upper = self.middle + width
+        self.lower = self.middle - width
+        return self.value
+
+
+class StreamingATR:
+    """Average true range; ticks without high/low count as bars with high == low == close."""
+
+    def __init__(self, window: int = 14):
+        self.smma = StreamingSMMA(window)
+        self.prev_close = None
+        self.value = math.nan
+
+    def update(self, close: float, high: float = None, low: float = None) -> float:
+        high = close if high is None else high
+        low = close if low is None else low
+        prev_close = close if self.prev_close is None else self.prev_close
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self.prev_close = close
+        self.value = self.smma.update(0.0 if math.isnan(tr) else tr)
+        return self.value
+
+
+class StreamingIndicators:
+    """The technical indicators of one token, updated together per tick.
+
+    snapshot() uses the column names of the crypto technical analysis.
+    """
+
+    def __init__(self, history: int = 30):
+        self.sma_20 = StreamingSMA(20)
+        self.sma_50 = StreamingSMA(50)
+        self.ema_12 = StreamingEMA(12)
+        self.ema_26 = StreamingEMA(26)
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD(12, 26, 9)
+        self.boll = StreamingBollinger(20)
+        self.atr = StreamingATR(14)
+        self.recent = deque(maxlen=history)
+        self.ticks = 0
+        self.price = math.nan
+        self.timestamp = None
+
+    def update(self, price: float, timestamp: float = None, high: float = None, low: float = None):
+        self.price = price
+        self.timestamp = timestamp
+        self.ticks += 1
+        self.sma_20.update(price)
+        self.sma_50.update(price)
+        self.ema_12.update(price)
+        self.ema_26.update(price)
+        self.rsi.update(price)
+        self.macd.update(price)
+        self.boll.update(price)
+        self.atr.update(price, high, low)
+        self.recent.append(self._row())
+
+    def _row(self) -> Dict[str, float]:
+        return {
+            "price": self.price,
+            "sma_20": self.sma_20.value,
+            "sma_50": self.sma_50.value,
+            "ema_12": self.ema_12.value,
+            "ema_26": self.ema_26.value,
+            "rsi": self.rsi.value,
+            "bb_middle": self.boll.middle,
+            "bb_upper": self.boll.upper,
+            "bb_lower": self.boll.lower,
+            "macd": self.macd.macd,
+            "macd_signal": self.macd.signal,
+            "macd_histogram": self.macd.histogram,
+            "atr": self.atr.value,
+        }
+
+    def snapshot(self) -> Dict:
+        row = self._row()
+        return {
+            "current_price": row.pop("price"),
+            **row,
+            "ticks": self.ticks,
+            "as_of": self.timestamp,
+            "price_data": list(self.recent),
+        }
+
+
+class OraclePriceSource:
+    """Polls current prices of a set of tokens from a CryptoPriceOracle.
+
+    All tokens are requested together in one /simple/price call per poll.
+    """
+
+    def __init__(self, oracle, token_ids: Iterable[str], vs_currency: str = "usd"):
+        self.oracle = oracle
+        self.token_ids = list(token_ids)
+        self.vs_currency = vs_currency
+
+    def poll(self) -> List[Tick]:
+        data = self.oracle.get_token_price_coingecko(",".join(self.token_ids), self.vs_currency)
+        if "error" in data:
+            return []
+        now = time.time()
+        ticks = []
+        for token_id in self.token_ids:
+            price = data.get(token_id, {}).get(self.vs_currency)
+            if price is not None:
+                ticks.append((token_id, now, float(price)))
+        return ticks
+
+
+class ReplayPriceSource:
+    """Replays recorded ticks from a local file, a stand-in for a websocket feed.
+
+    The file is either json lines of {"token": ..., "timestamp": ..., "price": ...}
+    or a csv with token, timestamp and price columns. Each poll returns the
+    next batch_size ticks, an empty list once the file is exhausted.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1):
+        self.path = path
+        self.batch_size = batch_size
+        self._ticks = self._read(path)
+        self._position = 0
+
+    @staticmethod
+    def _read(path: str) -> List[Tick]:
+        with open(path, "r") as f:
+            if path.endswith(".csv"):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+        return [(str(row["token"]), float(row["timestamp"]), float(row["price"])) for row in rows]
+
+    def poll(self) -> List[Tick]:
+        ticks = self._ticks[self._position : self._position + self.batch_size]
+        self._position += len(ticks)
+        return ticks
+
+
+class StreamingIndicatorHub:
+    """Live indicator state of many tokens, fed by a price source.
+
+    poll_once pulls one batch of ticks from the source; start runs it every
+    interval seconds in a background thread. snapshot returns a token's
+    current indicators once it has seen min_ticks ticks (after seeding from
+    history or from the feed), None before that.
+    """
+
+    def __init__(self, source=None, min_ticks: int = 50, factory: Callable[[], StreamingIndicators] = StreamingIndicators):
+        self.source = source
+        self.min_ticks = min_ticks
+        self.factory = factory
+        self._tokens: Dict[str, StreamingIndicators] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def on_tick(self, token_id: str, timestamp: float, price: float, high: float = None, low: float = None):
+        with self._lock:
+            indicators = self._tokens.get(token_id)
+            if indicators is None:
+                indicators = self._tokens[token_id] = self.factory()
+            indicators.update(price, timestamp, high, low)
+
+    def seed(self, token_id: str, prices: Iterable[Tuple[float, float]]):
+        """Warm a token up from (timestamp, price) history, oldest first."""
+        for timestamp, price in prices:
+            self.on_tick(token_id, timestamp, price)
+
+    def poll_once(self) -> int:
+        """Apply one batch from the source, returning the number of ticks."""
+        ticks = self.source.poll() if self.source is not None else []
+        for token_id, timestamp, price in ticks:
+            self.on_tick(token_id, timestamp, price)
+        return len(ticks)
+
+    def start(self, interval: float = 60):
+        """Poll the source every interval seconds in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"Streaming indicator poll failed: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="streaming-indicators", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def tokens(self) -> List[str]:
+        with self._lock:
+            return list(self._tokens)
+
+    def snapshot(self, token_id: str) -> Optional[Dict]:
+        with self._lock:
+            indicators = self._tokens.get(token_id)
+            if indicators is None or indicators.ticks < self.min_ticks:
+                return None
+            return indicators.snapshot()
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_streaming_hub() -> StreamingIndicatorHub:
+    """Process-wide hub read by the crypto technical analysis."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = StreamingIndicatorHub()
+        return _hub
@@ -8,6 +8,25 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Cache settings
+    "indicator_cache_max_bytes": 256 * 1024 * 1024,
+    "finnhub_cache_max_tickers": 64,
+    "finnhub_sqlite_min_bytes": 64 * 1024 * 1024,
+    "google_news_cache_ttl": 24 * 60 * 60,  # seconds, None to never expire
+    "google_news_cache_max_bytes": 256 * 1024 * 1024,
+    "openai_tool_cache_ttl": 24 * 60 * 60,  # seconds, None to never expire
+    "openai_tool_cache_max_bytes": 64 * 1024 * 1024,
+    "crypto_cache_max_bytes": 64 * 1024 * 1024,
+    "crypto_memo_ttl": 30 * 60,  # seconds crypto data is reused within a run
+    "crypto_memo_max_entries": 1024,
+    # Google News fetching
+    "google_news_requests_per_second": 0.25,
+    "google_news_burst": 1,
+    "google_news_max_workers": 3,  # connections kept alive to Google News
+    # Market data prefetch
+    "propagate_max_concurrency": 4,  # concurrent runs in propagate_many
+    "prefetch_max_concurrency": 4,
+    "prefetch_batch_size": 50,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
@@ -17,8 +36,20 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    "run_log_dir": "eval_results",  # run_log.jsonl of the final state of every run
+    "run_log_compress": False,  # gzip the run log records (run_log.jsonl.gz)
+    "checkpoint_db": None,  # sqlite file checkpointing every graph step, for resume
+    "parallel_analysts": False,  # run the analysts concurrently instead of in sequence
+    "parallel_debate_openings": False,  # give the first debate arguments concurrently
     # Tool settings
     "online_tools": True,
+    "tool_replay_mode": "off",  # "record" tool outputs, "replay" them without network
+    "tool_replay_dir": None,  # defaults to data_cache_dir/tool_replay
+    "onchain_call_timeout": 30,  # seconds per onchain data source
+    "coin_list_refresh_interval": 24 * 3600,  # seconds between coin list downloads
+    "crypto_stream_interval": 60,  # seconds between live price polls
+    "crypto_stream_min_ticks": 50,  # ticks before live indicators are served
+    "insider_max_records": None,  # cap on insider entries per report, None for all
     # Report saving settings
     "always_save_reports": True,
     "save_complete_report": True,
@@ -43,6 +43,17 @@ class ConditionalLogic:
             return "tools_fundamentals"
         return "Msg Clear Fundamentals"
 
+    def should_continue_analyst(self, analyst_type: str, messages_key: str = "messages"):
+        """Router of an analyst's tool loop over the messages in messages_key."""
+
+        def should_continue(state: AgentState):
+            last_message = state[messages_key][-1]
+            if last_message.tool_calls:
+                return f"tools_{analyst_type}"
+            return f"Msg Clear {analyst_type.capitalize()}"
+
+        return should_continue
+
     def should_continue_debate(self, state: AgentState) -> str:
         """Determine if debate should continue."""
 
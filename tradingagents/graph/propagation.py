@@ -1,6 +1,6 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -41,9 +41,15 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        run_id is used as the checkpointer thread of the run.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if run_id is not None:
+            config["configurable"] = {"thread_id": run_id}
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
@@ -0,0 +1,149 @@
+# TradingAgents/graph/run_log.py
+
+import gzip
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, fall back to in-process locking
+    fcntl = None
+
+_CHUNK_SIZE = 1 << 16
+
+
+class RunLog:
+    """Append-only log of the final states of graph runs, one record per run.
+
+    Records are json lines in {directory}/run_log.jsonl, or with compress
+    in {directory}/run_log.jsonl.gz where every record is its own gzip
+    member (a valid multi-member gzip file, readable by gzip/zcat).
+    Appending never rewrites earlier records. An index from
+    (company_of_interest, trade_date) to the offset of the latest record of
+    that run is built by scanning the log once and kept up to date as
+    records are appended, also by other processes.
+    """
+
+    def __init__(self, directory: str, compress: bool = False):
+        self.directory = directory
+        self.compress = compress
+        self.path = os.path.join(
+            directory, "run_log.jsonl.gz" if compress else "run_log.jsonl"
+        )
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._scanned_to = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(record: Dict[str, Any]) -> Tuple[str, str]:
+        return record["company_of_interest"], str(record["trade_date"])
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        line = (json.dumps(record) + "\n").encode()
+        return gzip.compress(line, mtime=0) if self.compress else line
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Append a record, returning its offset in the log."""
+        data = self._encode(record)
+        with self._lock, self._file_lock():
+            self._scan()
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(data)
+            self._index[self.key(record)] = offset
+            self._scanned_to = offset + len(data)
+        return offset
+
+    def _scan(self):
+        """Index the records appended since the last scan; the caller holds _lock."""
+        if not os.path.exists(self.path):
+            return
+        for offset, end, line in self._lines_from(self._scanned_to):
+            self._index[self.key(json.loads(line))] = offset
+            self._scanned_to = end
+
+    def _lines_from(self, start: int) -> Iterator[Tuple[int, int, bytes]]:
+        """(offset, end offset, json line) of the complete records from start on."""
+        if not self.compress:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written by another process
+                    yield offset, offset + len(line), line
+                    offset += len(line)
+            return
+
+        # one gzip member per record: decompress member by member, reading
+        # the file in chunks so records stream without loading the whole log
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            record_start = position = start
+            member, parts, data = zlib.decompressobj(wbits=31), [], b""
+            while True:
+                if not data:
+                    data = f.read(_CHUNK_SIZE)
+                    if not data:
+                        return  # end of the log, or a record still being written
+                try:
+                    parts.append(member.decompress(data))
+                except zlib.error:
+                    return
+                if not member.eof:
+                    position += len(data)
+                    data = b""
+                    continue
+                rest = member.unused_data
+                position += len(data) - len(rest)
+                yield record_start, position, b"".join(parts)
+                record_start, data = position, rest
+                member, parts = zlib.decompressobj(wbits=31), []
+
+    def refresh(self):
+        """Pick up records appended by other processes."""
+        with self._lock:
+            self._scan()
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """(ticker, trade date) of every logged run."""
+        self.refresh()
+        return list(self._index)
+
+    def get(self, ticker: str, trade_date: str) -> Optional[Dict[str, Any]]:
+        """Latest record of a run, None if it was never logged."""
+        key = (ticker, str(trade_date))
+        if key not in self._index:
+            self.refresh()
+        offset = self._index.get(key)
+        if offset is None:
+            return None
+        for _, _, line in self._lines_from(offset):
+            return json.loads(line)
+        return None
+
+    def iter_records(self, ticker: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the records in log order, optionally those of one ticker only."""
+        if not os.path.exists(self.path):
+            return
+        for _, _, line in self._lines_from(0):
+            record = json.loads(line)
+            if ticker is None or record["company_of_interest"] == ticker:
+                yield record
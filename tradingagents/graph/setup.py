@@ -1,17 +1,91 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
-from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.agent_states import AgentState, analyst_channel
 from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
 
 
+def run_on_channel(analyst_node, messages_key: str):
+    """Run an analyst node on its own messages channel instead of messages.
+
+    The channel starts out with the same opening message as messages.
+    """
+
+    def channel_state(state):
+        messages = state[messages_key]
+        opening = []
+        if not messages:
+            opening = [HumanMessage(content=state["company_of_interest"])]
+        return opening, {**state, "messages": opening + messages}
+
+    def channel_update(opening, update):
+        update = dict(update)
+        update[messages_key] = opening + update.pop("messages")
+        return update
+
+    def node(state):
+        opening, analyst_state = channel_state(state)
+        return channel_update(opening, analyst_node.invoke(analyst_state))
+
+    async def anode(state):
+        opening, analyst_state = channel_state(state)
+        return channel_update(opening, await analyst_node.ainvoke(analyst_state))
+
+    return RunnableLambda(node, afunc=anode)
+
+
+def run_as_opening(debater_node, state_key: str, speaker: str):
+    """Run a debater's opening argument without writing the debate state.
+
+    The debater's updated state_key is stored under speaker in
+    debate_openings, so several openings can run in the same step.
+    """
+
+    def node(state):
+        update = debater_node.invoke(state)
+        return {"debate_openings": {speaker: update[state_key]}}
+
+    async def anode(state):
+        update = await debater_node.ainvoke(state)
+        return {"debate_openings": {speaker: update[state_key]}}
+
+    return RunnableLambda(node, afunc=anode)
+
+
+def merge_openings(state_key: str, speakers):
+    """Fold the openings of speakers into state_key as if given in that order.
+
+    Each opening's argument is appended to the history, the fields a
+    speaker updated are taken over (the last speaker's latest response
+    winning) and count advances by one per speaker, so the sequential
+    rounds and their routing continue as after a turn-based first round.
+    """
+
+    def node(state):
+        base = state[state_key]
+        base_history = base.get("history", "")
+        merged = dict(base)
+        for speaker in speakers:
+            opening = state["debate_openings"][speaker]
+            merged["history"] += opening["history"][len(base_history):]
+            for key, value in opening.items():
+                if key not in ("history", "count") and value != base.get(key, ""):
+                    merged[key] = value
+        merged["count"] = base["count"] + len(speakers)
+        return {state_key: merged}
+
+    return node
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -41,7 +115,11 @@ class GraphSetup:
         self.conditional_logic = conditional_logic
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        parallel_openings=False,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +129,13 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently, each on its
+                own messages channel, instead of one after the other
+            parallel_openings (bool): Give the opening arguments of the investment
+                debate and of the risk debate concurrently; later rounds stay
+                turn-based
+            checkpointer: LangGraph checkpointer saving the state after every
+                step, so failed runs can be resumed
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -133,6 +218,19 @@ class GraphSetup:
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        if parallel_analysts:
+            # every analyst converses on its own channel
+            for analyst_type in analyst_nodes:
+                channel = analyst_channel(analyst_type)
+                analyst_nodes[analyst_type] = run_on_channel(
+                    analyst_nodes[analyst_type], channel
+                )
+                delete_nodes[analyst_type] = create_msg_delete(channel)
+                tool_nodes[analyst_type] = ToolNode(
+                    list(tool_nodes[analyst_type].tools_by_name.values()),
+                    messages_key=channel,
+                )
+
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
@@ -151,31 +249,91 @@ class GraphSetup:
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
+        if parallel_openings:
+            investment_speakers = ["Bull Researcher", "Bear Researcher"]
+            risk_speakers = ["Risky Analyst", "Safe Analyst", "Neutral Analyst"]
+            debaters = {
+                "Bull Researcher": bull_researcher_node,
+                "Bear Researcher": bear_researcher_node,
+                "Risky Analyst": risky_analyst,
+                "Safe Analyst": safe_analyst,
+                "Neutral Analyst": neutral_analyst,
+            }
+            for speaker in investment_speakers:
+                workflow.add_node(
+                    f"{speaker.split()[0]} Opening",
+                    run_as_opening(debaters[speaker], "investment_debate_state", speaker),
+                )
+            for speaker in risk_speakers:
+                workflow.add_node(
+                    f"{speaker.split()[0]} Opening",
+                    run_as_opening(debaters[speaker], "risk_debate_state", speaker),
+                )
+            workflow.add_node(
+                "Merge Debate Openings",
+                merge_openings("investment_debate_state", investment_speakers),
+            )
+            workflow.add_node(
+                "Merge Risk Openings",
+                merge_openings("risk_debate_state", risk_speakers),
+            )
+            debate_entry = ["Bull Opening", "Bear Opening"]
+            risk_entry = ["Risky Opening", "Safe Opening", "Neutral Opening"]
+        else:
+            debate_entry = ["Bull Researcher"]
+            risk_entry = ["Risky Analyst"]
+
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        if parallel_analysts:
+            # Fan out from the start and join before the investment debate
+            for analyst_type in selected_analysts:
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+                workflow.add_edge(START, current_analyst)
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    self.conditional_logic.should_continue_analyst(
+                        analyst_type, analyst_channel(analyst_type)
+                    ),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+            for entry in debate_entry:
+                workflow.add_edge(
+                    [
+                        f"Msg Clear {analyst_type.capitalize()}"
+                        for analyst_type in selected_analysts
+                    ],
+                    entry,
+                )
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
 
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    for entry in debate_entry:
+                        workflow.add_edge(current_clear, entry)
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -195,7 +353,8 @@ class GraphSetup:
             },
         )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
+        for entry in risk_entry:
+            workflow.add_edge("Trader", entry)
         workflow.add_conditional_edges(
             "Risky Analyst",
             self.conditional_logic.should_continue_risk_analysis,
@@ -221,7 +380,31 @@ class GraphSetup:
             },
         )
 
+        if parallel_openings:
+            # Continue turn-based from the merged first round
+            workflow.add_edge(debate_entry, "Merge Debate Openings")
+            workflow.add_conditional_edges(
+                "Merge Debate Openings",
+                self.conditional_logic.should_continue_debate,
+                {
+                    "Bull Researcher": "Bull Researcher",
+                    "Bear Researcher": "Bear Researcher",
+                    "Research Manager": "Research Manager",
+                },
+            )
+            workflow.add_edge(risk_entry, "Merge Risk Openings")
+            workflow.add_conditional_edges(
+                "Merge Risk Openings",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Risky Analyst": "Risky Analyst",
+                    "Safe Analyst": "Safe Analyst",
+                    "Neutral Analyst": "Neutral Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -1,10 +1,12 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
-from pathlib import Path
-import json
+import sqlite3
+import uuid
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterable, Iterator, NamedTuple
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -12,6 +14,17 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 
 from langgraph.prebuilt import ToolNode
 
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:  # optional, needed for checkpoint_db
+    SqliteSaver = None
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:  # optional, needed for checkpoint_db with apropagate
+    AsyncSqliteSaver = None
+
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
@@ -21,14 +34,27 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.prefetch import prefetch_bars
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
+from .run_log import RunLog
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 
 
+class RunResult(NamedTuple):
+    """Outcome of one (company, date) run of propagate_many."""
+
+    company_name: str
+    trade_date: str
+    final_state: Optional[Dict[str, Any]]
+    decision: Optional[str]
+    error: Optional[BaseException] = None
+    run_id: Optional[str] = None
+
+
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
 
@@ -104,10 +130,60 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+
+        # Final states of the runs, appended one record per run
+        self.run_log = RunLog(
+            self.config.get("run_log_dir", "eval_results"),
+            compress=self.config.get("run_log_compress", False),
+        )
+
+        self.last_run_id = None
+
+        # Checkpoint every step when a checkpoint database is configured
+        self.checkpointer = self._create_checkpointer()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self._graph_options = (
+            selected_analysts,
+            self.config.get("parallel_analysts", False),
+            self.config.get("parallel_debate_openings", False),
+        )
+        self.graph = self.graph_setup.setup_graph(
+            *self._graph_options, checkpointer=self.checkpointer
+        )
+
+    def _create_checkpointer(self):
+        """SQLite checkpointer at the checkpoint_db path, None if not configured."""
+        checkpoint_db = self.config.get("checkpoint_db")
+        if not checkpoint_db:
+            return None
+        if SqliteSaver is None:
+            raise ImportError(
+                "checkpoint_db requires langgraph-checkpoint-sqlite: "
+                "pip install langgraph-checkpoint-sqlite"
+            )
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_db)), exist_ok=True)
+        # shared by the threads of propagate_many, SqliteSaver serializes access
+        return SqliteSaver(sqlite3.connect(checkpoint_db, check_same_thread=False))
+
+    @asynccontextmanager
+    async def _async_graph(self):
+        """Graph for one async run, checkpointing to checkpoint_db if configured.
+
+        aiosqlite connections belong to the event loop that opened them, so
+        each run checkpoints through its own AsyncSqliteSaver connection to
+        the database, closed when the run ends. The checkpoints are the same
+        as those of propagate, so resume and replay_from work on async runs.
+        """
+        if self.checkpointer is None:
+            yield self.graph
+            return
+        if AsyncSqliteSaver is None:
+            raise ImportError(
+                "checkpoint_db with apropagate requires aiosqlite: pip install aiosqlite"
+            )
+        async with aiosqlite.connect(self.config["checkpoint_db"]) as conn:
+            yield self.graph.copy(update={"checkpointer": AsyncSqliteSaver(conn)})
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -180,16 +256,176 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def prefetch(self, plan):
+        """Pull the price history of every ticker in a run plan into the local bar store.
+
+        Args:
+            plan: Tickers, or (ticker, trade date) pairs, about to be propagated
+
+        Returns:
+            dict: ticker -> path of its stored bars
+        """
+        return prefetch_bars(
+            plan,
+            max_concurrency=self.config.get("prefetch_max_concurrency", 4),
+            batch_size=self.config.get("prefetch_batch_size", 50),
+        )
+
+    def propagate(self, company_name, trade_date, run_id=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        run_id (default: a new uuid, kept in last_run_id) names the run's
+        checkpoints; pass it to resume if the run fails.
+        """
 
         self.ticker = company_name
+        self.last_run_id = run_id = run_id or uuid.uuid4().hex
+
+        with self.toolkit.run_scope(run_id):
+            final_state = self._run(company_name, trade_date, run_id)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    def propagate_many(
+        self,
+        plan: Iterable[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+    ) -> Iterator[RunResult]:
+        """Run the graph for many (company, date) pairs concurrently.
+
+        Runs share this instance's LLM clients, toolkit caches and memories
+        but nothing else, and are yielded as they complete. A failed run is
+        yielded with its error instead of stopping the others.
 
+        Args:
+            plan: (company, trade date) pairs
+            max_concurrency: Runs in flight at once, defaults to the
+                propagate_max_concurrency config value
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get("propagate_max_concurrency", 4)
+
+        def run(company_name, trade_date, run_id):
+            # each run memoizes its own crypto data
+            with self.toolkit.run_scope(run_id):
+                final_state = self._run(company_name, trade_date, run_id)
+            return final_state, self.process_signal(final_state["final_trade_decision"])
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {}
+            for company_name, trade_date in plan:
+                run_id = uuid.uuid4().hex
+                future = executor.submit(run, company_name, trade_date, run_id)
+                futures[future] = (company_name, trade_date, run_id)
+            for future in as_completed(futures):
+                company_name, trade_date, run_id = futures[future]
+                try:
+                    final_state, decision = future.result()
+                except Exception as e:
+                    yield RunResult(company_name, str(trade_date), None, None, e, run_id)
+                else:
+                    yield RunResult(
+                        company_name, str(trade_date), final_state, decision, run_id=run_id
+                    )
+
+    def resume(self, run_id):
+        """Finish a checkpointed run from its last completed step.
+
+        Returns the same (final_state, decision) as propagate; a run that
+        already finished is not run again.
+        """
+        config = self._run_config(run_id)
+        snapshot = self.graph.get_state(config)
+        if not snapshot.values:
+            raise ValueError(f"No checkpoints for run {run_id}")
+        if snapshot.next:
+            with self.toolkit.run_scope(run_id):
+                self.graph.invoke(None, config)
+        return self._finish_checkpointed(config)
+
+    def replay_from(self, run_id, node):
+        """Run a checkpointed run again from the last step before node.
+
+        The replay forks the run from that checkpoint: node and everything
+        after it are executed again, earlier steps are reused.
+        """
+        config = self._run_config(run_id)
+        for snapshot in self.graph.get_state_history(config):
+            if node in snapshot.next:
+                break
+        else:
+            raise ValueError(f"Run {run_id} never reached {node}")
+        with self.toolkit.run_scope(run_id):
+            self.graph.invoke(
+                None, {**snapshot.config, "recursion_limit": config["recursion_limit"]}
+            )
+        return self._finish_checkpointed(config)
+
+    def _run_config(self, run_id):
+        if self.checkpointer is None:
+            raise ValueError("Checkpointing is disabled, set checkpoint_db in the config")
+        return self.propagator.get_graph_args(run_id)["config"]
+
+    def _finish_checkpointed(self, config):
+        final_state = self.graph.get_state(config).values
+        self.ticker = final_state["company_of_interest"]
+        self.last_run_id = config["configurable"]["thread_id"]
+        self._log_state(final_state["trade_date"], final_state)
+        self.curr_state = final_state
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    async def apropagate(self, company_name, trade_date, run_id=None):
+        """Async propagate: runs the graph with ainvoke on the running event loop.
+
+        LLM calls are awaited; data tools, which are synchronous, run in
+        the loop's default executor. Does not set ticker, curr_state or
+        last_run_id, so many runs can be awaited concurrently; reflect on
+        the returned state, and pass a run_id to be able to resume the run.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        with self.toolkit.run_scope(run_id):
+            final_state = await self._arun(company_name, trade_date, run_id)
+        decision = await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+        return final_state, decision
+
+    async def _arun(self, company_name, trade_date, run_id=None):
+        """Async _run."""
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args(run_id)
+
+        async with self._async_graph() as graph:
+            if self.debug:
+                trace = []
+                async for chunk in graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) > 0:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+                final_state = trace[-1]
+            else:
+                final_state = await graph.ainvoke(init_agent_state, **args)
+
+        self._log_state(trade_date, final_state)
+
+        return final_state
+
+    def _run(self, company_name, trade_date, run_id=None):
+        """Invoke the graph for one company and date and log its final state.
+
+        Touches no per-run attributes of the instance, so runs can overlap.
+        """
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        args = self.propagator.get_graph_args(run_id)
 
         if self.debug:
             # Debug mode with tracing
@@ -206,20 +442,16 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
-        # Store current state for reflection
-        self.curr_state = final_state
-
         # Log state
         self._log_state(trade_date, final_state)
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state
 
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Append the final state to the run log."""
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
-            "trade_date": final_state["trade_date"],
+            "trade_date": str(trade_date),
             "market_report": final_state["market_report"],
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
@@ -247,15 +479,7 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
-
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        self.run_log.append(entry)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""